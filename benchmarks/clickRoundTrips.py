@@ -0,0 +1,53 @@
+"""Benchmark of webdriver round-trips made by DriverCommands clicks
+
+Counts commands sent to driver for 1000 clicks with highlighting enabled and
+disabled, compared to previous highlightMyElement (4 script calls per click).
+No browser is needed, driver only counts commands.
+
+usage: python -m benchmarks.clickRoundTrips
+
+"""
+
+from lib.driverCommands import DriverCommands
+
+CLICKS = 1000
+PREVIOUS_HIGHLIGHT_CALLS = 4
+
+
+class CountingDriver(object):
+    def __init__(self):
+        self.commands = 0
+
+    def execute_script(self, script, *args):
+        self.commands += 1
+
+
+class CountingElement(object):
+    def __init__(self, driver):
+        self.driver = driver
+
+    def click(self):
+        self.driver.commands += 1
+
+
+def count_round_trips(highlight):
+    driver = CountingDriver()
+    commands = DriverCommands(driver)
+    commands.highlight = highlight
+    element = CountingElement(driver)
+    for _ in range(CLICKS):
+        commands.click_by_element(element)
+    return driver.commands
+
+
+def main():
+    previous = CLICKS * (PREVIOUS_HIGHLIGHT_CALLS + 1)
+    print('Round-trips per %s clicks:' % CLICKS)
+    print('  previous highlight: %s' % previous)
+    for name, highlight in (('highlight on', True), ('highlight off', False)):
+        round_trips = count_round_trips(highlight)
+        print('  %s: %s (saved %s)' % (name, round_trips, previous - round_trips))
+
+
+if __name__ == '__main__':
+    main()
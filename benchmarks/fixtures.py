@@ -0,0 +1,135 @@
+"""Deterministic local pages for benchmarks served by in-process HTTP server
+
+Pages:
+* /table - table with TABLE_ROWS rows, first column is record name 'record_<n>'
+* /delayed - elements rendered, shown and enabled after DELAY_MS
+* /form - form with FORM_FIELDS text fields
+* /alerts - page with ALERTS notifyjs-like alerts, hidden after DELAY_MS
+* /attributes - elements with attributes and properties read differently by get_attribute
+
+usage:
+    with FixtureServer() as server:
+        driver.get(server.url('/table'))
+
+"""
+
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+TABLE_ROWS = 2000
+TABLE_COLUMNS = 6
+FORM_FIELDS = 40
+ALERTS = 50
+DELAY_MS = 500
+
+
+def table_page():
+    header = ''.join('<th>column_%s</th>' % column for column in range(TABLE_COLUMNS))
+    rows = ''.join('<tr>%s</tr>' % ''.join('<td class="c%s">%s_%s</td>' % (column, 'record' if column == 0 else 'value',
+                                                                            row if column == 0 else row * column)
+                                           for column in range(TABLE_COLUMNS))
+                   for row in range(TABLE_ROWS))
+    return '<table id="table"><tr>%s</tr>%s</table>' % (header, rows)
+
+
+def delayed_page():
+    return """
+        <div id="container"></div>
+        <button id="button" disabled>Save</button>
+        <div id="hidden" style="display: none">Hidden</div>
+        <script>
+            setTimeout(function () {
+                document.getElementById('container').innerHTML = '<span id="delayed">Ready</span>';
+                document.getElementById('button').disabled = false;
+                document.getElementById('hidden').style.display = 'block';
+            }, %s);
+        </script>
+    """ % DELAY_MS
+
+
+def form_page():
+    fields = ''.join('<label>Field %s <input id="field_%s" name="field_%s" type="text"></label>' % (n, n, n)
+                     for n in range(FORM_FIELDS))
+    return '<form id="form">%s</form>' % fields
+
+
+def alerts_page():
+    alerts = ''.join('<div class="notifyjs-wrapper">Alert %s</div>' % n for n in range(ALERTS))
+    return """
+        <div class="notifyjs-corner">%s</div>
+        <script>
+            setTimeout(function () {
+                document.querySelector('body > div.notifyjs-corner').style.display = 'none';
+            }, %s);
+        </script>
+    """ % (alerts, DELAY_MS)
+
+
+ATTRIBUTE_ELEMENTS = ['text', 'disabled', 'checkbox', 'checked', 'readonly', 'styled', 'link', 'image', 'option',
+                      'selected_option', 'data']
+ATTRIBUTES = ['value', 'disabled', 'checked', 'selected', 'readonly', 'readOnly', 'style', 'href', 'src', 'class',
+              'id', 'data-id', 'title', 'type', 'missing']
+
+
+def attributes_page():
+    return """
+        <input id="text" type="text" value="initial" class="field big" title="Text">
+        <input id="disabled" type="text" disabled>
+        <input id="checkbox" type="checkbox">
+        <input id="checked" type="checkbox" checked>
+        <input id="readonly" type="text" readonly value="fixed">
+        <div id="styled" style="color: red; display: block" data-id="7">Styled</div>
+        <a id="link" href="/table">Table</a>
+        <img id="image" src="/missing.png" alt="">
+        <select><option id="option">a</option><option id="selected_option" selected>b</option></select>
+        <span id="data" data-id="data-1" hidden>Data</span>
+        <script>document.getElementById('text').value = 'typed';</script>
+    """
+
+
+PAGES = {
+    '/table': table_page,
+    '/delayed': delayed_page,
+    '/form': form_page,
+    '/alerts': alerts_page,
+    '/attributes': attributes_page,
+}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    cache = {}
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        if path not in PAGES:
+            self.send_error(404)
+            return
+        if path not in self.cache:
+            body = '<!DOCTYPE html><html><head><title>%s</title></head><body>%s</body></html>' % (
+                path.strip('/'), PAGES[path]())
+            self.cache[path] = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(self.cache[path])))
+        self.end_headers()
+        self.wfile.write(self.cache[path])
+
+    def log_message(self, *args):
+        pass
+
+
+class FixtureServer(object):
+    def __init__(self, host='127.0.0.1', port=0):
+        self.server = ThreadingHTTPServer((host, port), FixtureHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def url(self, path):
+        return 'http://%s:%s%s' % (self.server.server_address[0], self.server.server_address[1], path)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
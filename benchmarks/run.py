@@ -0,0 +1,227 @@
+"""Benchmarks of framework overhead on local fixture pages
+
+Every benchmark opens fixture page (not measured) and measures one operation:
+wall time (median of repeats), webdriver round-trips, python memory peak and
+browser JS heap size (chrome only). Memory is measured in separate run, so
+tracemalloc doesn't slow down timed runs. Wait statistics are reset before
+every run, so adaptive waits start from the same state. Browser is started with headless 'perf'
+profile, see lib.createDriver.get_browser_profile.
+
+usage:
+    python -m benchmarks.run --output benchmarks/results/current.json [--repeat 5] [--only table] [--config KEY=VALUE]
+    python -m benchmarks.run compare baseline.json current.json [--threshold 0.2]
+
+"""
+
+import os
+import sys
+import time
+import json
+import argparse
+import statistics
+import tracemalloc
+from selenium.webdriver.common.by import By
+from lib.configurationReader import apply_cli_overrides, set_overrides
+from lib.fileManager import FileManager
+from lib.waitStatistics import wait_statistics
+from benchmarks.fixtures import FixtureServer, TABLE_ROWS, FORM_FIELDS
+
+FORM = {(By.ID, 'field_%s' % n): 'value %s' % n for n in range(FORM_FIELDS)}
+LAST_RECORD = 'record_%s' % (TABLE_ROWS - 1)
+
+
+def bench_table_create_matrix(context):
+    context.table.table_create_matrix()
+
+
+def bench_table_create_matrix_bulk(context):
+    context.table.table_create_matrix(bulk=True)
+
+
+def bench_find_table_record(context):
+    context.table.find_table_record(LAST_RECORD)
+
+
+def bench_find_table_record_repeated(context):
+    for _ in range(10):
+        context.table.find_table_record(LAST_RECORD)
+
+
+def bench_fill_in(context):
+    for selector, value in FORM.items():
+        context.commands.fill_in(selector, value)
+
+
+def bench_fill_form(context):
+    context.commands.fill_form(FORM)
+
+
+def bench_get_attribute_single(context):
+    for selector in FORM:
+        context.commands.get_attribute_from_element(selector)
+
+
+def bench_get_attributes_bulk(context):
+    context.commands.get_attributes(list(FORM))
+
+
+def bench_is_element_displayed(context):
+    for _ in range(20):
+        context.commands.is_element_displayed((By.ID, 'hidden'))
+
+
+def wait_benchmark(engine, method, *args):
+    def bench(context):
+        context.commands.waitCommands.engine = engine
+        getattr(context.commands.waitCommands, method)(*args, wait=5)
+    return bench
+
+
+BENCHMARKS = [
+    ('table_create_matrix', '/table', bench_table_create_matrix),
+    ('table_create_matrix_bulk', '/table', bench_table_create_matrix_bulk),
+    ('find_table_record', '/table', bench_find_table_record),
+    ('find_table_record_repeated', '/table', bench_find_table_record_repeated),
+    ('fill_in', '/form', bench_fill_in),
+    ('fill_form', '/form', bench_fill_form),
+    ('get_attribute_from_element', '/form', bench_get_attribute_single),
+    ('get_attributes', '/form', bench_get_attributes_bulk),
+    ('is_element_displayed', '/delayed', bench_is_element_displayed),
+]
+for wait_engine in ('python', 'browser'):
+    BENCHMARKS += [
+        ('wait_for_element_visibility_%s' % wait_engine, '/delayed',
+         wait_benchmark(wait_engine, 'wait_for_element_visibility', (By.ID, 'delayed'))),
+        ('wait_for_presence_of_element_located_%s' % wait_engine, '/delayed',
+         wait_benchmark(wait_engine, 'wait_for_presence_of_element_located', (By.ID, 'delayed'))),
+        ('wait_from_element_clickable_%s' % wait_engine, '/delayed',
+         wait_benchmark(wait_engine, 'wait_from_element_clickable', (By.ID, 'button'))),
+        ('wait_for_expected_text_%s' % wait_engine, '/delayed',
+         wait_benchmark(wait_engine, 'wait_for_expected_text', (By.ID, 'container'), 'Ready')),
+        ('wait_for_element_not_visibility_%s' % wait_engine, '/alerts',
+         wait_benchmark(wait_engine, 'wait_for_element_not_visibility', By.CSS_SELECTOR,
+                        'body > div.notifyjs-corner')),
+    ]
+
+
+class Context(object):
+    def __init__(self, driver):
+        from pages.basePage import get_commands
+        from pages.table import Table
+        self.driver = driver
+        self.commands = get_commands(driver)
+        self.table = Table(driver)
+        self.round_trips = 0
+        self.execute = driver.execute
+
+        def counting_execute(driver_command, params=None):
+            self.round_trips += 1
+            return self.execute(driver_command, params)
+        driver.execute = counting_execute
+
+    def close(self):
+        self.driver.execute = self.execute
+
+
+def js_heap_size(driver):
+    return driver.execute_script('return window.performance.memory ? window.performance.memory.usedJSHeapSize : null')
+
+
+def prepare(driver, server, page):
+    driver.get(server.url(page))
+    wait_statistics.reset()
+    return Context(driver)
+
+
+def run_benchmark(driver, server, name, page, bench, repeat):
+    times = []
+    for _ in range(repeat):
+        context = prepare(driver, server, page)
+        start = time.perf_counter()
+        bench(context)
+        times.append(time.perf_counter() - start)
+        round_trips = context.round_trips
+        context.close()
+    context = prepare(driver, server, page)
+    tracemalloc.start()
+    try:
+        bench(context)
+        python_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        context.close()
+    return {
+        'wall_time': round(statistics.median(times), 4),
+        'wall_time_min': round(min(times), 4),
+        'round_trips': round_trips,
+        'python_memory_peak': python_peak,
+        'js_heap_size': js_heap_size(driver),
+    }
+
+
+def run(output, repeat, only=None):
+    from lib.createDriver import create_driver
+    results = {'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'repeat': repeat, 'benchmarks': {}}
+    driver = create_driver()
+    try:
+        with FixtureServer() as server:
+            for name, page, bench in BENCHMARKS:
+                if only and only not in name:
+                    continue
+                results['benchmarks'][name] = run_benchmark(driver, server, name, page, bench, repeat)
+                print('%-45s %8.4f s %6s round-trips' % (name, results['benchmarks'][name]['wall_time'],
+                                                          results['benchmarks'][name]['round_trips']))
+    finally:
+        driver.quit()
+    if output:
+        if os.path.dirname(output) and not os.path.exists(os.path.dirname(output)):
+            os.makedirs(os.path.dirname(output))
+        FileManager.save_data_to_json_file(output, results)
+    return results
+
+
+def compare(baseline_file, current_file, threshold):
+    """Compare benchmark results with baseline
+
+        :param baseline_file: path to baseline json
+        :param current_file: path to current results json
+        :param threshold: allowed relative increase of wall time, round-trips and memory e.g. 0.2
+        :return: list of regressions
+    """
+    baseline = FileManager.load_data_from_json_file(baseline_file)['benchmarks']
+    current = FileManager.load_data_from_json_file(current_file)['benchmarks']
+    regressions = []
+    for name in sorted(set(baseline) & set(current)):
+        for metric in ('wall_time', 'round_trips', 'python_memory_peak'):
+            before, after = baseline[name][metric], current[name][metric]
+            change = (after - before) / float(before) if before else 0.0
+            flag = 'REGRESSION' if change > threshold else ''
+            print('%-45s %-20s %12s -> %12s %+7.1f%% %s' % (name, metric, before, after, change * 100, flag))
+            if flag:
+                regressions.append((name, metric, before, after))
+    return regressions
+
+
+def main(argv=None):
+    set_overrides(BROWSER_PROFILES={'CHROME': 'perf', 'FF': 'perf'}, HIGHLIGHT_ELEMENTS=False)
+    argv = apply_cli_overrides(sys.argv[1:] if argv is None else argv)
+    if argv and argv[0] == 'compare':
+        parser = argparse.ArgumentParser(prog='python -m benchmarks.run compare')
+        parser.add_argument('baseline')
+        parser.add_argument('current')
+        parser.add_argument('--threshold', type=float, default=0.2, help='allowed relative increase')
+        args = parser.parse_args(argv[1:])
+        regressions = compare(args.baseline, args.current, args.threshold)
+        print(json.dumps({'regressions': len(regressions)}))
+        return 1 if regressions else 0
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run')
+    parser.add_argument('--output', help='json results file, use it later as baseline')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--only', help='run benchmarks with this text in name')
+    args = parser.parse_args(argv)
+    run(args.output, args.repeat, args.only)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
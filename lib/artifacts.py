@@ -0,0 +1,140 @@
+"""Failure artifacts: screenshot, page source and browser console logs
+
+Data is taken from browser in test thread, encoding and writing to disk is done
+by background thread pool. When ARTIFACT_QUEUE_SIZE captures are waiting for
+writing or ARTIFACT_MAX_TOTAL_MB is written in this run, next artifacts are
+dropped instead of stopping tests. Screenshots can be downscaled
+(SCREENSHOT_SCALE) and saved as 'jpeg' or 'webp' (SCREENSHOT_FORMAT), which
+needs Pillow installed. Artifacts are captured once per name (full test id),
+first failure of test is kept.
+
+usage: get_artifact_collector().capture(driver, 'tests.sample_test.SampleTest.test_01_add')
+
+"""
+
+import io
+import os
+import json
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from selenium.common.exceptions import WebDriverException
+from lib.configurationReader import load_configuration_from_file
+from lib.logger import Logger
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+CONFIG = load_configuration_from_file('connect_config.json')
+
+ARTIFACTS_DIR = os.path.join(os.path.abspath(os.path.dirname(os.path.dirname(__file__))), 'screenshots')
+
+log = Logger()
+
+
+class ArtifactCollector(object):
+    def __init__(self, directory=None, workers=None, queue_size=None, max_total_mb=None):
+        """
+        :param directory: output directory, default ARTIFACTS_DIR from config or screenshots/
+        :param workers: number of writing threads, default ARTIFACT_WORKERS
+        :param queue_size: max captures waiting for writing, default ARTIFACT_QUEUE_SIZE
+        :param max_total_mb: max size of all artifacts of run, default ARTIFACT_MAX_TOTAL_MB
+        """
+        self.directory = directory or CONFIG.get('ARTIFACTS_DIR') or ARTIFACTS_DIR
+        self.image_format = CONFIG.get('SCREENSHOT_FORMAT', 'png').lower()
+        self.scale = CONFIG.get('SCREENSHOT_SCALE', 1)
+        self.max_total_size = (max_total_mb or CONFIG.get('ARTIFACT_MAX_TOTAL_MB', 500)) * 1024 * 1024
+        self.total_size = 0
+        self._captured = set()
+        self._file_sizes = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers or CONFIG.get('ARTIFACT_WORKERS', 2))
+        self._slots = threading.BoundedSemaphore(queue_size or CONFIG.get('ARTIFACT_QUEUE_SIZE', 20))
+        self._lock = threading.Lock()
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+
+    def capture(self, driver, name):
+        """Take screenshot, page source and browser logs and save them in background
+
+            :param driver: webdriver
+            :param name: artifacts file name without extension
+        """
+        with self._lock:
+            if name in self._captured:
+                return
+            self._captured.add(name)
+        if self.total_size >= self.max_total_size:
+            log.logger('WARNING', 'Artifacts size limit reached, %s not saved', name)
+            return
+        if not self._slots.acquire(blocking=False):
+            log.logger('WARNING', 'Too many artifacts waiting for writing, %s not saved', name)
+            return
+        try:
+            screenshot = driver.get_screenshot_as_png()
+            source = driver.page_source
+        except WebDriverException as e:
+            self._slots.release()
+            log.logger('ERROR', 'Browser unable to get a screenshot: %s', e)
+            return
+        try:
+            console = driver.get_log('browser')
+        except (WebDriverException, AttributeError):
+            console = []
+        self._executor.submit(self.__write, name, screenshot, source, console)
+
+    def flush(self):
+        """Wait until all captured artifacts are written"""
+        self._executor.shutdown(wait=True)
+
+    def __write(self, name, screenshot, source, console):
+        try:
+            image, extension = self.__encode(screenshot)
+            files = ((extension, image), ('html', source.encode('utf-8')),
+                     ('log.json', json.dumps(console).encode('utf-8')))
+            for extension, data in files:
+                path = os.path.join(self.directory, '%s.%s' % (name, extension))
+                with self._lock:
+                    size = self.total_size - self._file_sizes.get(path, 0) + len(data)
+                    if size > self.max_total_size:
+                        log.logger('WARNING', 'Artifacts size limit reached, %s.%s not saved', name, extension)
+                        continue
+                    self.total_size = size
+                    self._file_sizes[path] = len(data)
+                with open(path, 'wb') as fp:
+                    fp.write(data)
+            log.logger('INFO', 'Artifacts saved: %s', os.path.join(self.directory, name))
+        except Exception as e:
+            log.logger('ERROR', 'Artifacts %s not saved: %s', name, e)
+        finally:
+            self._slots.release()
+
+    def __encode(self, screenshot):
+        if self.image_format == 'png' and self.scale == 1:
+            return screenshot, 'png'
+        if Image is None:
+            log.logger('WARNING', 'Pillow is not installed, screenshot saved as png')
+            return screenshot, 'png'
+        image = Image.open(io.BytesIO(screenshot))
+        if self.scale != 1:
+            image = image.resize((int(image.width * self.scale), int(image.height * self.scale)))
+        if self.image_format in ('jpeg', 'jpg'):
+            image = image.convert('RGB')
+        output = io.BytesIO()
+        image.save(output, format=self.image_format.replace('jpg', 'jpeg').upper())
+        return output.getvalue(), self.image_format
+
+
+_collector = None
+_collector_lock = threading.Lock()
+
+
+def get_artifact_collector():
+    """Artifact collector shared by process, created on first failure"""
+    global _collector
+    with _collector_lock:
+        if _collector is None:
+            _collector = ArtifactCollector()
+            atexit.register(_collector.flush)
+        return _collector
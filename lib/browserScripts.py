@@ -0,0 +1,132 @@
+"""Javascript snippets shared by commands executed inside the browser
+
+FIND_ELEMENTS defines findElements(by, value) function which resolves selenium
+selector tuple (eg. By.ID, 'element/id') to list of DOM elements and
+isVisible(element) function.
+
+Bulk scripts take list of selectors and do all their work in one call.
+
+"""
+
+FIND_ELEMENTS = """
+    function findElements(by, value) {
+        var root = document;
+        switch (by) {
+            case 'id':
+                var element = root.getElementById(value);
+                return element ? [element] : [];
+            case 'name':
+                return Array.prototype.slice.call(root.getElementsByName(value));
+            case 'tag name':
+                return Array.prototype.slice.call(root.getElementsByTagName(value));
+            case 'class name':
+                return Array.prototype.slice.call(root.getElementsByClassName(value));
+            case 'css selector':
+                return Array.prototype.slice.call(root.querySelectorAll(value));
+            case 'link text':
+            case 'partial link text':
+                return Array.prototype.filter.call(root.getElementsByTagName('a'), function (a) {
+                    var text = (a.innerText || a.textContent).trim();
+                    return by === 'link text' ? text === value : text.indexOf(value) !== -1;
+                });
+            case 'xpath':
+                var found = [];
+                var snapshot = root.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                for (var i = 0; i < snapshot.snapshotLength; i++) {
+                    found.push(snapshot.snapshotItem(i));
+                }
+                return found;
+        }
+        throw new Error('Unsupported selector strategy: ' + by);
+    }
+
+    function isVisible(element) {
+        if (!element.isConnected || !element.getClientRects().length) {
+            return false;
+        }
+        var style = window.getComputedStyle(element);
+        return style.visibility !== 'hidden' && style.visibility !== 'collapse' && style.opacity !== '0';
+    }
+"""
+
+FILL_FORM = FIND_ELEMENTS + """
+    var NATIVE_TYPES = ['file', 'checkbox', 'radio', 'button', 'submit', 'image', 'reset'];
+    return arguments[0].map(function (field) {
+        var element = findElements(field[0], field[1])[0];
+        if (!element) { return 'missing'; }
+        var tag = element.tagName.toLowerCase();
+        if (['input', 'textarea', 'select'].indexOf(tag) === -1 || element.disabled || element.readOnly ||
+                NATIVE_TYPES.indexOf((element.type || '').toLowerCase()) !== -1) {
+            return 'native';
+        }
+        var prototype = {input: HTMLInputElement, textarea: HTMLTextAreaElement, select: HTMLSelectElement}[tag];
+        var setter = Object.getOwnPropertyDescriptor(prototype.prototype, 'value').set;
+        element.focus();
+        setter.call(element, field[2]);
+        element.dispatchEvent(new Event('input', {bubbles: true}));
+        element.dispatchEvent(new Event('change', {bubbles: true}));
+        element.blur();
+        return element.value === String(field[2]) ? 'ok' : 'native';
+    });
+"""
+
+GET_TEXTS = FIND_ELEMENTS + """
+    return arguments[0].map(function (selector) {
+        var element = findElements(selector[0], selector[1])[0];
+        return element ? element.innerText : null;
+    });
+"""
+
+GET_ATTRIBUTES = FIND_ELEMENTS + """
+    // same rules as selenium getAttribute atom, so bulk result equals WebElement.get_attribute
+    var BOOLEAN_ATTRIBUTES = ['allowfullscreen', 'allowpaymentrequest', 'allowusermedia', 'async', 'autofocus',
+        'autoplay', 'checked', 'compact', 'complete', 'controls', 'declare', 'default', 'defaultchecked',
+        'defaultselected', 'defer', 'disabled', 'ended', 'formnovalidate', 'hidden', 'indeterminate',
+        'iscontenteditable', 'ismap', 'itemscope', 'loop', 'multiple', 'muted', 'nohref', 'nomodule', 'noresize',
+        'noshade', 'novalidate', 'nowrap', 'open', 'paused', 'playsinline', 'pubdate', 'readonly', 'required',
+        'reversed', 'scoped', 'seamless', 'seeking', 'selected', 'truespeed', 'typemustmatch', 'willvalidate'];
+    var PROPERTY_ALIASES = {'class': 'className', 'readonly': 'readOnly'};
+
+    function isSelectable(element) {
+        var tag = element.tagName.toLowerCase();
+        var type = (element.type || '').toLowerCase();
+        return tag === 'option' || (tag === 'input' && (type === 'checkbox' || type === 'radio'));
+    }
+
+    function getAttribute(element, attribute) {
+        var name = attribute.toLowerCase();
+        var tag = element.tagName.toLowerCase();
+        if (name === 'style') {
+            return element.style ? element.style.cssText : null;
+        }
+        if ((name === 'selected' || name === 'checked') && isSelectable(element)) {
+            return (tag === 'option' ? element.selected : element.checked) ? 'true' : null;
+        }
+        if ((tag === 'a' && name === 'href') || (tag === 'img' && name === 'src')) {
+            return element.getAttribute(name) ? element[name] : element.getAttribute(name);
+        }
+        var property = PROPERTY_ALIASES[attribute] || attribute;
+        if (BOOLEAN_ATTRIBUTES.indexOf(name) !== -1) {
+            return element.getAttribute(attribute) !== null || element[property] ? 'true' : null;
+        }
+        var value = element[property];
+        if (value === null || value === undefined || typeof value === 'object' || typeof value === 'function') {
+            value = element.getAttribute(attribute);
+        }
+        return value === null || value === undefined ? null : String(value);
+    }
+
+    var attribute = arguments[1];
+    return arguments[0].map(function (selector) {
+        var element = findElements(selector[0], selector[1])[0];
+        return element ? getAttribute(element, attribute) : false;
+    });
+"""
+
+PROBE_ELEMENTS = FIND_ELEMENTS + """
+    return arguments[0].map(function (selector) {
+        var element = findElements(selector[0], selector[1])[0];
+        if (!element) { return [false, false, false, false]; }
+        return [true, isVisible(element), !element.disabled, !!(element.checked || element.selected)];
+    });
+"""
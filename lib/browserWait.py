@@ -0,0 +1,93 @@
+"""Waits resolved inside the browser
+
+Condition is checked by MutationObserver and requestAnimationFrame callbacks in
+the page, so whole wait costs one webdriver round-trip and returns as soon as
+condition is true.
+
+usage: BrowserWait(driver).until((By.ID, 'element/id'), 'visibility', 5)
+
+"""
+
+from selenium.common.exceptions import TimeoutException
+from lib.browserScripts import FIND_ELEMENTS
+
+CONDITIONS = ('presence', 'visibility', 'invisibility', 'text', 'clickable')
+
+BROWSER_WAIT_SCRIPT = FIND_ELEMENTS + """
+    var by = arguments[0], value = arguments[1], condition = arguments[2], expected = arguments[3];
+    var timeout = arguments[4], done = arguments[arguments.length - 1];
+    var finished = false, observer = null, timer = null;
+
+    function check() {
+        var element = findElements(by, value)[0] || null;
+        switch (condition) {
+            case 'presence':
+                return element;
+            case 'visibility':
+                return element && isVisible(element) ? element : null;
+            case 'invisibility':
+                return !element || !isVisible(element) ? true : null;
+            case 'text':
+                return element && (element.innerText || element.textContent).indexOf(expected) !== -1 ? true : null;
+            case 'clickable':
+                return element && isVisible(element) && !element.disabled ? element : null;
+        }
+    }
+
+    function finish(result) {
+        if (finished) { return; }
+        finished = true;
+        if (observer) { observer.disconnect(); }
+        clearTimeout(timer);
+        done(result);
+    }
+
+    function onFrame() {
+        if (finished) { return; }
+        var result = check();
+        if (result) { finish(result); } else { window.requestAnimationFrame(onFrame); }
+    }
+
+    var result = check();
+    if (result) {
+        finish(result);
+    } else {
+        observer = new MutationObserver(function () {
+            var result = check();
+            if (result) { finish(result); }
+        });
+        observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+        window.requestAnimationFrame(onFrame);
+        timer = setTimeout(function () { finish(null); }, timeout);
+    }
+"""
+
+
+class BrowserWait(object):
+    def __init__(self, driver):
+        self.driver = driver
+        self.script_timeout = None
+
+    def until(self, selector, condition, wait, expected_text=None):
+        """Wait inside the browser until condition is true
+
+            :param selector: tuple (eg. By.ID, 'element/id')
+            :param condition: one of CONDITIONS
+            :param wait: time to wait in seconds
+            :param expected_text: text to find in element for 'text' condition
+            :return: element for 'presence', 'visibility', 'clickable' or True
+        """
+        if condition not in CONDITIONS:
+            raise ValueError('Unknown condition %s, available: %s' % (condition, ', '.join(CONDITIONS)))
+        self.__set_script_timeout(wait + 1)
+        by, value = selector
+        result = self.driver.execute_async_script(BROWSER_WAIT_SCRIPT, by, value, condition, expected_text,
+                                                  int(wait * 1000))
+        if not result:
+            raise TimeoutException('Condition %s not met for %s' % (condition, str(selector)))
+        return result
+
+    def __set_script_timeout(self, timeout):
+        if self.script_timeout is None or self.script_timeout < timeout:
+            self.driver.set_script_timeout(timeout)
+            self.script_timeout = timeout
@@ -1,20 +1,165 @@
+"""Configuration reader
+
+Every configuration file is parsed once per process and served as immutable
+Configuration snapshot. Values can be overridden (in order of importance):
+* by overrides set with set_overrides() or apply_cli_overrides() e.g. '--config BROWSER=FF'
+* by environment variables with SELENIUM_ prefix e.g. SELENIUM_WAIT_TIMEOUT=5
+Only keys present in configuration file can be overridden, values are parsed as json
+when possible (e.g. 5, true, "text"), otherwise used as string.
+
+Modules keep configuration loaded at import, so overrides should be set before
+test modules are imported.
+
+"""
+
 import os
 import json
-from lib.randomDataGenerator import FileManager
+import threading
+from collections.abc import Mapping
+from lib.fileManager import FileManager
 
 CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'configuration')
+ENV_PREFIX = 'SELENIUM_'
 fileManager = FileManager()
 
+_cache = {}
+_overrides = {}
+_lock = threading.RLock()
+
+
+class Configuration(Mapping):
+    """Immutable configuration, values available as config['KEY'] or config.KEY"""
+
+    def __init__(self, data):
+        object.__setattr__(self, '_data', {key: _freeze(value) for key, value in data.items()})
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getattr__(self, key):
+        if key == '_data' or key.startswith('__'):
+            raise AttributeError(key)
+        try:
+            return self._data[key]
+        except KeyError:
+            raise AttributeError('No configuration value: %s' % key)
+
+    def __setattr__(self, key, value):
+        raise TypeError('Configuration is read only')
+
+    def __repr__(self):
+        return 'Configuration(%r)' % self._data
+
+    def __reduce__(self):
+        return Configuration, (self.to_dict(),)
+
+    def to_dict(self):
+        """Mutable copy of configuration
+
+            :return: dictionary
+        """
+        return {key: _thaw(value) for key, value in self._data.items()}
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return Configuration(value)
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, Configuration):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def _parse_value(value):
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
 
 def load_configuration_from_file(file_name):
-    """Function opens json file from configuration directory
+    """Function opens json file from configuration directory. File is parsed only once,
+    next calls return cached configuration.
+
+        :param file_name: config file name
+
+        :return: data from json file in Configuration (dictionary, object.attribute) format
+    """
+    file_path = os.path.join(CONFIG_PATH, file_name)
+    with _lock:
+        if file_path not in _cache:
+            _cache[file_path] = _read_configuration(file_path)
+        return _cache[file_path][1]
+
+
+def reload_configuration(file_name):
+    """Parse configuration file again if it was modified since it was loaded
 
         :param file_name: config file name
 
-        :return: data from json file in object.attribute format
+        :return: current configuration
     """
     file_path = os.path.join(CONFIG_PATH, file_name)
+    with _lock:
+        cached = _cache.get(file_path)
+        if cached is None or cached[0] != os.path.getmtime(file_path):
+            _cache[file_path] = _read_configuration(file_path)
+        return _cache[file_path][1]
+
+
+def set_overrides(**overrides):
+    """Override configuration values in this process e.g. per worker port or browser
+
+        :param overrides: KEY=value pairs
+    """
+    with _lock:
+        _overrides.update(overrides)
+        _cache.clear()
+
+
+def apply_cli_overrides(argv):
+    """Take '--config KEY=VALUE' options from command line arguments and set them as overrides
+
+        :param argv: list of command line arguments
+        :return: arguments without --config options
+    """
+    remaining = []
+    overrides = {}
+    args = iter(argv)
+    for arg in args:
+        if arg == '--config':
+            key, _, value = next(args, '').partition('=')
+            overrides[key] = _parse_value(value)
+        elif arg.startswith('--config='):
+            key, _, value = arg[len('--config='):].partition('=')
+            overrides[key] = _parse_value(value)
+        else:
+            remaining.append(arg)
+    set_overrides(**overrides)
+    return remaining
+
+
+def _read_configuration(file_path):
     fileManager.check_if_file_exists(file_path)
+    mtime = os.path.getmtime(file_path)
     with open(file_path, 'r') as config_file:
         config = json.load(config_file)
-    return config
+    for key in config:
+        if ENV_PREFIX + key in os.environ:
+            config[key] = _parse_value(os.environ[ENV_PREFIX + key])
+        if key in _overrides:
+            config[key] = _overrides[key]
+    return mtime, Configuration(config)
@@ -1,12 +1,121 @@
+import threading
 from selenium import webdriver
 from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 from lib.configurationReader import load_configuration_from_file
 from lib.logger import Logger
+from lib.profiler import profiler
+from lib.networkMock import network_mock
 
 CONFIG = load_configuration_from_file('connect_config.json')
 
 log = Logger()
 
+_display = None
+_display_lock = threading.Lock()
+_firefox_profiles = {}
+_firefox_profiles_lock = threading.Lock()
+
+
+def get_browser_profile(browser):
+    """
+    Function returns settings of browser profile set for browser in BROWSER_PROFILES config.
+    Profile "perf" means PERF_PROFILE settings: headless browser without images, animations,
+    extensions and GPU, with fixed window size, browser log level and shared disk cache directory.
+    :param browser: browser name e.g. "CHROME"
+    :return: profile settings or None for default profile
+    """
+    profile = CONFIG.get('BROWSER_PROFILES', {}).get(browser.upper(), 'default')
+    if profile == 'perf':
+        return CONFIG['PERF_PROFILE']
+    if profile != 'default':
+        raise ValueError('Unknown browser profile %s, available: default, perf' % profile)
+    return None
+
+
+def start_virtual_display(profile):
+    """
+    Function starts virtual X display (pyvirtualdisplay) for browsers with window when VIRTUAL_DISPLAY
+    is set in config. Display is started once and shared by all drivers of process.
+    :param profile: browser profile settings
+    """
+    global _display
+    if not CONFIG.get('VIRTUAL_DISPLAY') or (profile and profile['HEADLESS']):
+        return
+    # prewarm threads create drivers at the same time
+    with _display_lock:
+        if _display is not None:
+            return
+        from pyvirtualdisplay import Display
+        display = Display(visible=0, size=(1680, 1050))
+        display.start()
+        _display = display
+
+
+def chrome_options(profile):
+    options = webdriver.ChromeOptions()
+    if profile is None:
+        return options
+    if profile['HEADLESS']:
+        options.add_argument('--headless')
+    if profile['DISABLE_IMAGES']:
+        options.add_argument('--blink-settings=imagesEnabled=false')
+    if profile['DISABLE_ANIMATIONS']:
+        options.add_argument('--force-prefers-reduced-motion')
+        options.add_argument('--wm-window-animations-disabled')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--window-size=%s,%s' % tuple(profile['WINDOW_SIZE']))
+    if profile['DISK_CACHE_DIR']:
+        options.add_argument('--disk-cache-dir=%s' % profile['DISK_CACHE_DIR'])
+    return options
+
+
+def firefox_options(profile):
+    options = webdriver.FirefoxOptions()
+    if profile is not None and profile['HEADLESS']:
+        options.add_argument('-headless')
+    return options
+
+
+def set_firefox_preferences(profile, fp):
+    fp.set_preference('webdriver.log.file', '/tmp/firefox_console')
+    if profile is None:
+        return
+    if profile['DISABLE_IMAGES']:
+        fp.set_preference('permissions.default.image', 2)
+    if profile['DISABLE_ANIMATIONS']:
+        fp.set_preference('toolkit.cosmeticAnimations.enabled', False)
+        fp.set_preference('ui.prefersReducedMotion', 1)
+    fp.set_preference('extensions.enabledScopes', 0)
+    fp.set_preference('layers.acceleration.disabled', True)
+    if profile['DISK_CACHE_DIR']:
+        fp.set_preference('browser.cache.disk.parent_directory', profile['DISK_CACHE_DIR'])
+
+
+def get_firefox_profile(profile):
+    """
+    Function returns firefox profile. Profile directory with preferences is built once per process
+    and every next driver gets copy of it instead of generating new profile.
+    :param profile: browser profile settings
+    :return: FirefoxProfile
+    """
+    key = id(profile)
+    with _firefox_profiles_lock:
+        if key not in _firefox_profiles:
+            fp = webdriver.FirefoxProfile()
+            set_firefox_preferences(profile, fp)
+            fp.update_preferences()
+            _firefox_profiles[key] = fp
+    return webdriver.FirefoxProfile(profile_directory=_firefox_profiles[key].path)
+
+
+def set_window(driver, profile):
+    if profile is None:
+        driver.maximize_window()
+    else:
+        driver.set_window_size(*profile['WINDOW_SIZE'])
+
 
 def create_driver(browser=CONFIG["BROWSER"]):
     """
@@ -19,21 +128,28 @@ def create_driver(browser=CONFIG["BROWSER"]):
     * "EDGE" for edge browser
     * "SAFARI" for safari browser
     Default browser is load from config.json file
+    Browser settings are selected by BROWSER_PROFILES config, see get_browser_profile()
+    PAGE_LOAD_STRATEGY config ('normal', 'eager' or 'none') sets when driver.get returns
     :return: driver
     """
+    profile = get_browser_profile(browser)
+    log_level = profile['BROWSER_LOG_LEVEL'] if profile else CONFIG.get('BROWSER_LOG_LEVEL', 'ALL')
+    start_virtual_display(profile)
     if browser.upper() == "FF":
-        d = DesiredCapabilities.FIREFOX
-        d['loggingPrefs'] = {'browser': 'ALL'}
-        fp = webdriver.FirefoxProfile()
-        fp.set_preference('webdriver.log.file', '/tmp/firefox_console')
-        driver = webdriver.Firefox(capabilities=d, firefox_profile=fp)
-        driver.maximize_window()
+        d = DesiredCapabilities.FIREFOX.copy()
+        d['loggingPrefs'] = {'browser': log_level}
+        d['pageLoadStrategy'] = CONFIG.get('PAGE_LOAD_STRATEGY', 'normal')
+        fp = get_firefox_profile(profile)
+        driver = webdriver.Firefox(capabilities=d, firefox_profile=fp, options=firefox_options(profile))
+        set_window(driver, profile)
     elif browser.upper() == "CHROME":
-        d = DesiredCapabilities.CHROME
-        d['loggingPrefs'] = {'browser': 'ALL'}
-        driver = webdriver.Chrome(desired_capabilities=d)
-        driver.set_window_size('1680', '1050')
-        driver.maximize_window()
+        d = DesiredCapabilities.CHROME.copy()
+        d['loggingPrefs'] = {'browser': log_level}
+        d['pageLoadStrategy'] = CONFIG.get('PAGE_LOAD_STRATEGY', 'normal')
+        driver = webdriver.Chrome(desired_capabilities=d, options=chrome_options(profile))
+        if profile is None:
+            driver.set_window_size('1680', '1050')
+        set_window(driver, profile)
     elif browser.upper() == "OPERA":
         driver = webdriver.Opera()
     elif browser.upper() == "IE":
@@ -49,5 +165,8 @@ def create_driver(browser=CONFIG["BROWSER"]):
         'CHROME', 'OPERA' 'IE', 'EDGE' or 'SAFARI'
         """
 
-    log.logger('INFO', '%s selenium driver started' % browser)
+    log.logger('INFO', '%s selenium driver started', browser)
+    network_mock.attach(driver)
+    if profiler.enabled:
+        profiler.instrument_driver(driver)
     return driver
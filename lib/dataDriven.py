@@ -0,0 +1,106 @@
+"""Data driven tests
+
+Test method marked with @data_driven is expanded into one test per record of
+data file from test_suites/ directory (csv with header, jsonl or json list).
+BaseTest expands marked methods of every subclass.
+
+Cases with the same state (value of state_key column) are run one after
+another on the class driver, so prepare_state() e.g. login or navigation is
+called only when state changes. Cases are named by global record index
+(test_login_<group>_<record> with state_key, test_login_<record> without). Cases are sharded across workers by
+DATA_SHARD_INDEX and DATA_SHARD_COUNT config values (SELENIUM_DATA_SHARD_INDEX
+environment variable per worker), cases with the same state stay on one worker.
+
+usage:
+    class LoginTest(BaseTest):
+        @data_driven('users.csv', state_key='page')
+        def test_login(self, record):
+            ...
+
+"""
+
+from lib.fileManager import FileManager
+from lib.configurationReader import load_configuration_from_file
+
+CONFIG = load_configuration_from_file('connect_config.json')
+
+
+def data_driven(filename, state_key=None):
+    """Mark test method to be expanded into one test per data file record
+
+        :param filename: data file name in test_suites/ directory
+        :param state_key: record key with page state shared by cases, None if cases don't share state
+    """
+    def decorator(method):
+        method.data_driven = (filename, state_key)
+        return method
+    return decorator
+
+
+def shard_groups(groups, shard_index, shard_count):
+    """Split groups of cases between shards. Biggest groups first, always to shard with less cases.
+
+        :param groups: list of (state, cases list) tuples
+        :param shard_index: number of current shard counted from 0
+        :param shard_count: number of shards
+        :return: groups of current shard in original order
+    """
+    if shard_count <= 1:
+        return groups
+    loads = [0] * shard_count
+    assigned = set()
+    for position, (_, cases) in sorted(enumerate(groups), key=lambda item: (-len(item[1][1]), item[0])):
+        shard = loads.index(min(loads))
+        loads[shard] += len(cases)
+        if shard == shard_index:
+            assigned.add(position)
+    return [group for position, group in enumerate(groups) if position in assigned]
+
+
+def expand_data_driven(cls, shard_index=None, shard_count=None):
+    """Replace marked test methods of class with generated test per data record
+
+        :param cls: test class
+        :param shard_index: number of current shard, default DATA_SHARD_INDEX from config
+        :param shard_count: number of shards, default DATA_SHARD_COUNT from config
+    """
+    shard_index = CONFIG.get('DATA_SHARD_INDEX', 0) if shard_index is None else shard_index
+    shard_count = CONFIG.get('DATA_SHARD_COUNT', 1) if shard_count is None else shard_count
+    for name, method in list(vars(cls).items()):
+        if not callable(method) or not hasattr(method, 'data_driven'):
+            continue
+        filename, state_key = method.data_driven
+        groups = _group_cases(FileManager().iter_test_data(filename), state_key, shard_count)
+        width = len(str(max(sum(len(group) for _, group in groups) - 1, 0)))
+        group_width = len(str(max(len(groups) - 1, 0)))
+        positions = {state: position for position, (state, _) in enumerate(groups)}
+        delattr(cls, name)
+        for state, group in shard_groups(groups, shard_index, shard_count):
+            for index, record in group:
+                # names use global record index, so case name is the same on every shard;
+                # with state_key global group number goes first to keep cases of one state together
+                if state_key is None:
+                    case_name = '%s_%s' % (name, str(index).zfill(width))
+                else:
+                    case_name = '%s_%s_%s' % (name, str(positions[state]).zfill(group_width), str(index).zfill(width))
+                setattr(cls, case_name, _make_case(method, record, state_key, index))
+
+
+def _group_cases(records, state_key, shard_count):
+    if state_key is None:
+        if shard_count <= 1:
+            return [(None, list(enumerate(records)))]
+        return [(None, [case]) for case in enumerate(records)]
+    groups = {}
+    for index, record in enumerate(records):
+        groups.setdefault(record[state_key], []).append((index, record))
+    return list(groups.items())
+
+
+def _make_case(method, record, state_key, index):
+    def case(self):
+        if state_key is not None:
+            self.ensure_state(record[state_key])
+        return method(self, record)
+    case.__doc__ = '%s [record %s]' % ((method.__doc__ or method.__name__).strip().split('\n')[0], index)
+    return case
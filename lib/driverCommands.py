@@ -5,11 +5,41 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.action_chains import ActionChains
 from lib.logger import Logger
 from lib.waitCommands import WaitCommands
+from lib.browserScripts import FILL_FORM, GET_TEXTS, GET_ATTRIBUTES
+from lib.elementCache import ElementCache
+from lib.elementProbe import probe_elements
+from lib.networkMock import network_mock
 from .configurationReader import load_configuration_from_file
 from selenium.webdriver.common.keys import Keys
 
 CONFIG = load_configuration_from_file('connect_config.json')
 
+STALE_RETRY_DELAYS = (0.05, 0.1, 0.2, 0.4)
+
+READY_STATE_SCRIPT = "return document.readyState !== 'loading';"
+
+SOFT_NAVIGATE_SCRIPT = """
+    window.history.pushState({}, '', arguments[0]);
+    window.dispatchEvent(new PopStateEvent('popstate', {state: {}}));
+"""
+
+HIGHLIGHT_SCRIPT = """
+    var element = arguments[0];
+    if (element.__seleniumStyle === undefined) {
+        element.__seleniumStyle = element.getAttribute('style');
+    }
+    clearTimeout(element.__seleniumHighlight);
+    element.setAttribute('style', (element.__seleniumStyle || '') + '; color: orange; outline: 4px solid orange;');
+    element.__seleniumHighlight = setTimeout(function () {
+        if (element.__seleniumStyle === null) {
+            element.removeAttribute('style');
+        } else {
+            element.setAttribute('style', element.__seleniumStyle);
+        }
+        delete element.__seleniumStyle;
+    }, arguments[1]);
+"""
+
 
 class DriverCommands:
     def __init__(self, driver):
@@ -17,25 +47,98 @@ class DriverCommands:
         self.log = Logger()
         self.base_url = CONFIG['BASE_URL']
         self.waitCommands = WaitCommands(self.driver)
-
-    def open_url(self, url):
+        self.highlight = CONFIG.get('HIGHLIGHT_ELEMENTS', True)
+        self.highlight_time = CONFIG.get('HIGHLIGHT_TIME', 300)
+        self.elementCache = ElementCache(self.driver)
+        self.page_load_strategy = CONFIG.get('PAGE_LOAD_STRATEGY', 'normal')
+
+    def open_url(self, url, ready=None, force=False, wait=10):
+        """Open url. With 'eager' or 'none' PAGE_LOAD_STRATEGY driver.get returns before
+        load event, so pass ready to wait only for what test needs.
+
+            :param url: url to open
+            :param ready: selector tuple (eg. By.ID, 'element/id') of element which has to be visible
+             or function taking driver, like expected conditions
+            :param force: open url even if browser is already on it
+            :param wait: time to wait for ready
+        """
+        if not force and self.__same_url(self.driver.current_url, url):
+            self.log.logger('INFO', 'Already on url: %s', url)
+            self.__wait_until_ready(ready, wait)
+            return
+        self.elementCache.invalidate(url)
+        network_mock.collect(self.driver)
         self.driver.get(url)
-        self.log.logger('INFO', 'Opened url: %s' % url)
+        network_mock.install(self.driver)
+        if ready is None and self.page_load_strategy == 'none':
+            ready = lambda driver: driver.execute_script(READY_STATE_SCRIPT)
+        self.__wait_until_ready(ready, wait)
+        self.log.logger('INFO', 'Opened url: %s', url)
+
+    def soft_navigate(self, url, ready=None, wait=10):
+        """Change route of single page application without reloading page: history.pushState
+        and popstate event, which is handled by most client side routers.
+
+            :param url: url or path to go to
+            :param ready: selector tuple or function taking driver, see open_url
+            :param wait: time to wait for ready
+        """
+        self.elementCache.invalidate()
+        self.driver.execute_script(SOFT_NAVIGATE_SCRIPT, url)
+        self.__wait_until_ready(ready, wait)
+        self.log.logger('INFO', 'Navigated to: %s', url)
+
+    def __wait_until_ready(self, ready, wait):
+        if ready is None:
+            return
+        if callable(ready):
+            try:
+                WebDriverWait(self.driver, wait).until(ready)
+            except TimeoutException:
+                raise AssertionError('Page is not ready after %s sec' % wait)
+        else:
+            self.waitCommands.wait_for_element_visibility(ready, wait)
+
+    @staticmethod
+    def __same_url(current_url, url):
+        return current_url.rstrip('/') == url.rstrip('/')
 
     def find_element(self, *selector):
-        """Find element on application view.
+        """Find element on application view. Element is always searched, cached elements are
+        used only by with_element, which handles stale elements.
 
             :param selector: tuple (eg. By.ID, 'element/id')
             :return: elements handler
         """
-        try:
+        for delay in STALE_RETRY_DELAYS:
+            try:
+                element = self.waitCommands.wait_for_presence_of_element_located(*selector)
+                break
+            except StaleElementReferenceException:
+                self.log.logger('WARNING', 'DOM Exception, trying again in %s sec', delay)
+                self.waitCommands.wait(delay)
+        else:
             element = self.waitCommands.wait_for_presence_of_element_located(*selector)
-        except StaleElementReferenceException:
-            self.log.logger('WARNING', 'DOM Exception')
-            self.waitCommands.wait(1)
-            element = self.driver.wait_for_presence_of_element_located(*selector)
         return element
 
+    def with_element(self, selector, action):
+        """Find element (cached if possible) and call action with it. If cached element
+        is stale, element is searched again and action repeated.
+
+            :param selector: tuple (eg. By.ID, 'element/id')
+            :param action: function which takes element
+            :return: action result
+        """
+        element = self.elementCache.get(selector)
+        if element is not None:
+            try:
+                return action(element)
+            except StaleElementReferenceException:
+                self.elementCache.discard(selector)
+        element = self.find_element(selector)
+        self.elementCache.put(selector, element)
+        return action(element)
+
     def find_elements(self, selector):
         """Find all element on visible view with selector
 
@@ -49,22 +152,14 @@ class DriverCommands:
         self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
 
     def highlightMyElement(self, element):
-        self.driver.execute_script("arguments[0].setAttribute('style', arguments[1]);", element,
-                                   "color: orange; border: 4px solid orange;")
-        self.driver.execute_script("arguments[0].setAttribute('style', arguments[1]);", element,
-                                   "color: pink; border: 4px solid pink;")
-        self.driver.execute_script("arguments[0].setAttribute('style', arguments[1]);", element,
-                                   "color: yellow; border: 4px solid yellow;")
-        self.driver.execute_script("arguments[0].setAttribute('style', arguments[1]);", element, "")
+        """Mark element with outline for HIGHLIGHT_TIME ms. Browser restores original style itself,
+        so highlighting costs one script call. Set HIGHLIGHT_ELEMENTS to false in config to disable it (e.g. on CI).
 
+            :param element: web element
         """
-                element = arguments[0];
-                original_style = element.getAttribute('style');
-                element.setAttribute('style', original_style + "; background: yellow; border: 2px solid red;");
-                setTimeout(function(){
-                    element.setAttribute('style', original_style);
-                }, 300);
-        """
+        if not self.highlight:
+            return
+        self.driver.execute_script(HIGHLIGHT_SCRIPT, element, self.highlight_time)
 
     def is_element_displayed(self, selector):
         """Returns bool value if element is or isn't displayed on page
@@ -72,11 +167,15 @@ class DriverCommands:
             :param selector: eg. (By.ID, 'elementID')
             :return: bool
         """
-        if len(self.find_elements(selector)) == 0:
-            return False
-        else:
-            element = self.driver.find_element(*selector)
-            return element.is_displayed()
+        return self.probe_elements([selector])[0].displayed
+
+    def probe_elements(self, selectors):
+        """Check state of many elements with one javascript call
+
+            :param selectors: list of tuples (eg. By.ID, 'element/id')
+            :return: list of ElementState(found, displayed, enabled, selected) in selectors order
+        """
+        return probe_elements(self.driver, selectors)
 
     def click_by_locator(self, selector):
         """Find element and click on it.
@@ -104,6 +203,56 @@ class DriverCommands:
         if confirm:
             element.submit()
 
+    def fill_form(self, fields):
+        """Fill in many fields with one javascript call. Value is set and input and change events are dispatched.
+        Fields which can't be filled by script (e.g. file inputs or fields not present yet) are filled with fill_in().
+
+            :param fields: dictionary {selector: text} e.g. {(By.ID, 'name'): 'John'}
+        """
+        fields = list(fields.items())
+        statuses = self.driver.execute_script(FILL_FORM, [[by, value, text] for (by, value), text in fields])
+        for (selector, text), status in zip(fields, statuses):
+            if status != 'ok':
+                self.log.logger('DEBUG', 'Field %s filled in natively (%s)', selector, status)
+                self.fill_in(selector, text)
+
+    def get_texts(self, selectors):
+        """Get texts of many elements with one javascript call. Elements not present yet are waited for.
+
+            :param selectors: list of tuples (eg. By.ID, 'element/id')
+            :return: list of texts
+        """
+        texts = self.driver.execute_script(GET_TEXTS, [list(selector) for selector in selectors])
+        return [self.get_text_from_element(selector) if text is None else text
+                for selector, text in zip(selectors, texts)]
+
+    def get_attributes(self, selectors, attribute='value'):
+        """Get attribute of many elements with one javascript call
+
+            :param selectors: list of tuples (eg. By.ID, 'element/id')
+            :param attribute: html value
+            :return: list of attribute values, None if element has no attribute
+        """
+        values = self.driver.execute_script(GET_ATTRIBUTES, [list(selector) for selector in selectors], attribute)
+        # false means element was not found yet, it is waited for by single element lookup
+        return [self.get_attribute_from_element(selector, attribute) if value is False else value
+                for selector, value in zip(selectors, values)]
+
+    def check_texts(self, expected_texts, skip_new_line=False):
+        """Get texts of many elements with one javascript call and compare with your expectation.
+
+            :param expected_texts: dictionary {selector: expected text}
+            :param skip_new_line: set true if you want skip '\\n' sign
+        """
+        selectors = list(expected_texts)
+        errors = []
+        for selector, text in zip(selectors, self.get_texts(selectors)):
+            if skip_new_line:
+                text = text.replace('\n', '')
+            if text != expected_texts[selector]:
+                errors.append("%s should be '%s' instead of '%s'" % (str(selector), expected_texts[selector], text))
+        assert not errors, 'Wrong texts. ' + '; '.join(errors)
+
     def clear_element(self, element):
         element.send_keys((Keys.CONTROL, "a"), Keys.DELETE)
 
@@ -111,8 +260,7 @@ class DriverCommands:
         """
         move mouse coursor up to element
         :param selector: selector for element"""
-        element = self.find_element(selector)
-        ActionChains(self.driver).move_to_element(element).perform()
+        self.with_element(selector, lambda element: ActionChains(self.driver).move_to_element(element).perform())
 
     def check_page_title(self, expected_title, wait=5):
         """Wait some time until title will be equal to expected
@@ -133,14 +281,18 @@ class DriverCommands:
         """
         return self.driver.title
 
-    def check_url(self, expected_url):
+    def check_url(self, expected_url, wait=0):
         """Check current url
 
         :param expected_url: expected url to compare with current url
+        :param wait: time to wait for url, useful after soft_navigate or with 'none' page load strategy
         """
         expected_url = CONFIG['BASE_URL'] + expected_url
-        url = self.driver.current_url
-        assert url == expected_url, 'Wrong page url expected: "%s", but is: %s' % (expected_url, url)
+        try:
+            WebDriverWait(self.driver, wait).until(EC.url_to_be(expected_url))
+        except TimeoutException:
+            url = self.driver.current_url
+            raise AssertionError('Wrong page url expected: "%s", but is: %s' % (expected_url, url))
 
     def get_text_from_element(self, selector):
         """Find element and get text from it.
@@ -148,8 +300,7 @@ class DriverCommands:
             :param selector: tuple (eg. By.ID, 'element/id')
             :return: text from element
         """
-        element = self.find_element(selector)
-        return element.text
+        return self.with_element(selector, lambda element: element.text)
 
     def get_attribute_from_element(self, selector, attribute='value'):
         """Find element and get text from it.
@@ -158,8 +309,7 @@ class DriverCommands:
             :param attribute: html value
             :return: text from element
         """
-        element = self.find_element(selector)
-        return element.get_attribute(attribute)
+        return self.with_element(selector, lambda element: element.get_attribute(attribute))
 
     def check_element_text(self, selector, expected_text, skip_new_line=False):
         """Find element, get text from it and compare with your expectation.
@@ -168,7 +318,7 @@ class DriverCommands:
             :param expected_text: text to compare with text from element
             :param skip_new_line: set true if you want skip '\\n' sign
         """
-        self.log.logger('INFO', 'Checking text. Text should be %s' % expected_text)
+        self.log.logger('INFO', 'Checking text. Text should be %s', expected_text)
         element_text = self.get_text_from_element(selector)
         if skip_new_line:
             element_text = element_text.replace('\n', '')
@@ -182,7 +332,7 @@ class DriverCommands:
             :param attribute: string - web element attribute e.g ()
             :param expected: text to compare with text from web element attribute
         """
-        self.log.logger('INFO', 'Checking text. Text should be %s' % expected)
+        self.log.logger('INFO', 'Checking text. Text should be %s', expected)
         attribute_value = self.get_attribute_from_element(selector, attribute)
         assert attribute_value == expected, "Wrong attribute value. Should be '%s' instead of '%s'" % (
             expected, attribute_value)
@@ -193,8 +343,7 @@ class DriverCommands:
             :param selector: tuple (eg. By.ID, 'element/id')
             :return: checkbox state (True or False)
         """
-        element = self.find_element(selector)
-        return element.is_selected()
+        return self.with_element(selector, lambda element: element.is_selected())
 
     def get_screenshot_file(self, driver, file_name):
         """
@@ -208,6 +357,6 @@ class DriverCommands:
         scr_file = os.path.join(scr_dir, file_name + '.png')
         try:
             driver.get_screenshot_as_file(scr_file)
-            self.log.logger('INFO', 'Screenshot saved: %s' % scr_file)
+            self.log.logger('INFO', 'Screenshot saved: %s', scr_file)
         except NoSuchWindowException:
             print('ERROR: Browser unable to get a screenshot')
@@ -0,0 +1,219 @@
+"""Pool of reusable selenium webdriver sessions
+
+usage:
+    pool = get_driver_pool()
+    driver = pool.acquire()
+    ...
+    pool.release(driver, tests_run=3)
+
+With PREWARM in config browsers are started in background threads ahead of
+demand: pool is filled up to POOL_SIZE and every recycled session is replaced
+right away, so acquire() gets ready driver instead of waiting for cold launch.
+
+"""
+
+import os
+import time
+import threading
+import atexit
+from urllib.parse import urlsplit
+from selenium.common.exceptions import WebDriverException
+from lib.createDriver import create_driver
+from lib.configurationReader import load_configuration_from_file
+from lib.logger import Logger
+
+CONFIG = load_configuration_from_file('connect_config.json')
+
+log = Logger()
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class DriverPool(object):
+    def __init__(self, size=None, max_tests=None, factory=create_driver, prewarm=None):
+        """Pool keeps up to `size` browser sessions and hands them out to workers
+
+            :param size: max number of browser sessions, default POOL_SIZE from config
+            :param max_tests: tests one session can run before it is recycled,
+                default MAX_TESTS_PER_SESSION from config (0 means no limit)
+            :param factory: function which creates new driver
+            :param prewarm: start drivers in background ahead of demand, default PREWARM from config
+        """
+        self.size = size or CONFIG.get('POOL_SIZE', 1)
+        self.max_tests = max_tests if max_tests is not None else CONFIG.get('MAX_TESTS_PER_SESSION', 0)
+        self.factory = factory
+        self._idle = []
+        self._tests_run = {}
+        self._created = 0
+        self._condition = threading.Condition()
+        self.prewarm_enabled = CONFIG.get('PREWARM', False) if prewarm is None else prewarm
+        self.startup_times = []
+        self.acquire_waits = []
+
+    def prewarm(self):
+        """Start drivers in background threads until pool is full"""
+        while True:
+            with self._condition:
+                if self._created >= self.size:
+                    return
+                self._created += 1
+            threading.Thread(target=self._prewarm_driver, daemon=True).start()
+
+    def startup_stats(self):
+        """Driver startup and acquire wait times
+
+            :return: dictionary with count, average and max of startup and acquire wait times in seconds
+        """
+        def stats(times):
+            times = list(times)
+            return {'count': len(times), 'average': round(sum(times) / len(times), 3) if times else None,
+                    'max': round(max(times), 3) if times else None}
+        return {'startup': stats(self.startup_times), 'acquire_wait': stats(self.acquire_waits)}
+
+    def acquire(self, timeout=None):
+        """Get idle driver from pool. New session is started if pool is not full yet,
+        otherwise waits until other worker releases its driver or a place in pool is freed.
+
+            :param timeout: time to wait for free driver, None means wait forever
+            :return: driver
+        """
+        start = time.time()
+        deadline = None if timeout is None else start + timeout
+        with self._condition:
+            while not self._idle and self._created >= self.size:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    raise AssertionError('No free driver in pool after %s seconds' % timeout)
+                self._condition.wait(remaining)
+            driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                self._created += 1
+        if driver is None:
+            driver = self._start_driver()
+        self.acquire_waits.append(time.time() - start)
+        return driver
+
+    def release(self, driver, tests_run=0):
+        """Give driver back to pool. Browser state is cleaned, session is recycled
+        when it reached MAX_TESTS_PER_SESSION or its state could not be cleaned.
+
+            :param driver: driver taken from pool by acquire()
+            :param tests_run: number of tests executed with driver since acquire()
+        """
+        key = id(driver)
+        self._tests_run[key] = self._tests_run.get(key, 0) + tests_run
+        if self.max_tests and self._tests_run[key] >= self.max_tests:
+            log.logger('INFO', 'Driver run %s tests, recycling session', self._tests_run[key])
+            self.recycle(driver)
+            return
+        try:
+            self.reset_driver(driver)
+        except WebDriverException as e:
+            log.logger('WARNING', 'Could not clean driver state, recycling session: %s', e)
+            self.recycle(driver)
+            return
+        self._put_idle(driver)
+
+    def recycle(self, driver):
+        """Quit driver session and free its place in pool
+
+            :param driver: driver to close
+        """
+        self._tests_run.pop(id(driver), None)
+        self._quit_driver(driver)
+        self._free_slot()
+        if self.prewarm_enabled:
+            self.prewarm()
+
+    @staticmethod
+    def reset_driver(driver):
+        """Close additional windows, clear storages and cookies and open about:blank.
+
+        Webdriver commands reach only origin of current page. With chrome DevTools
+        cookies of all origins and storages of BASE_URL origin are cleared as well.
+        local/session storage of other origins is not cleared.
+
+            :param driver: driver to clean
+        """
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException:
+            # storage is not available on pages like about:blank
+            pass
+        driver.delete_all_cookies()
+        if hasattr(driver, 'execute_cdp_cmd'):
+            base_url = urlsplit(CONFIG['BASE_URL'])
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                'origin': '%s://%s' % (base_url.scheme, base_url.netloc),
+                'storageTypes': 'local_storage,indexeddb,cache_storage,service_workers'})
+        # next class starts on empty page, so open_url never skips navigation to previous class page
+        driver.get('about:blank')
+
+    def close_all(self):
+        """Quit all idle drivers"""
+        self.prewarm_enabled = False
+        log.logger('INFO', 'Driver pool stats: %s', self.startup_stats())
+        with self._condition:
+            drivers, self._idle = self._idle, []
+        for driver in drivers:
+            self.recycle(driver)
+
+    def _start_driver(self):
+        start = time.time()
+        try:
+            driver = self.factory()
+        except Exception:
+            self._free_slot()
+            raise
+        self.startup_times.append(time.time() - start)
+        self._tests_run[id(driver)] = 0
+        return driver
+
+    def _prewarm_driver(self):
+        try:
+            driver = self._start_driver()
+        except Exception as e:
+            log.logger('ERROR', 'Driver prewarm failed: %s', e)
+            return
+        self._put_idle(driver)
+
+    def _put_idle(self, driver):
+        with self._condition:
+            self._idle.append(driver)
+            self._condition.notify_all()
+
+    def _free_slot(self):
+        # waiting acquire() starts new driver in freed place
+        with self._condition:
+            self._created -= 1
+            self._condition.notify_all()
+
+    @staticmethod
+    def _quit_driver(driver):
+        try:
+            driver.quit()
+        except WebDriverException as e:
+            log.logger('WARNING', 'Driver quit failed: %s', e)
+
+
+def get_driver_pool():
+    """Returns driver pool shared by all threads of current process.
+    Every worker process gets its own pool.
+
+        :return: DriverPool
+    """
+    pid = os.getpid()
+    with _pools_lock:
+        if pid not in _pools:
+            _pools[pid] = DriverPool()
+            atexit.register(_pools[pid].close_all)
+            if _pools[pid].prewarm_enabled:
+                _pools[pid].prewarm()
+        return _pools[pid]
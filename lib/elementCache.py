@@ -0,0 +1,79 @@
+"""Cache of found web elements
+
+Elements are cached per selector for DriverCommands.with_element, which repeats
+its action with fresh element when cached one is stale. Mode is set by
+ELEMENT_CACHE in config:
+* 'off' - elements are always searched again
+* 'navigation' - cache is cleared by open_url; cache hit costs no webdriver
+  calls. When cached element is stale, current url is compared with url of
+  cached elements and whole cache is cleared if page has changed.
+
+Only identity selectors (By.ID, By.NAME) are cached. Cached element is not
+checked against its selector again, so selectors of element state like
+(By.CSS_SELECTOR, '.row.selected') would keep returning previously matched
+element after in-page change which doesn't make it stale.
+
+"""
+
+from lib.configurationReader import load_configuration_from_file
+
+CONFIG = load_configuration_from_file('connect_config.json')
+
+MODES = ('off', 'navigation')
+IDENTITY_STRATEGIES = ('id', 'name')
+
+
+class ElementCache(object):
+    def __init__(self, driver, mode=None):
+        self.driver = driver
+        self.mode = mode or CONFIG.get('ELEMENT_CACHE', 'off')
+        if self.mode not in MODES:
+            raise ValueError('Unknown element cache mode %s, available: %s' % (self.mode, ', '.join(MODES)))
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._elements = {}
+        self._url = None
+
+    def get(self, selector):
+        """Cached element for selector
+
+            :param selector: tuple (eg. By.ID, 'element/id')
+            :return: element or None
+        """
+        if self.mode == 'off' or selector[0] not in IDENTITY_STRATEGIES:
+            return None
+        element = self._elements.get(selector)
+        if element is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return element
+
+    def put(self, selector, element):
+        if self.mode != 'off' and selector[0] in IDENTITY_STRATEGIES:
+            self._elements[selector] = element
+
+    def discard(self, selector):
+        """Remove stale element from cache, all elements are removed when url has changed"""
+        self.stale += 1
+        self._elements.pop(selector, None)
+        if self.mode == 'off':
+            return
+        url = self.driver.current_url
+        if url != self._url:
+            self.invalidate(url)
+
+    def invalidate(self, url=None):
+        """Remove all elements e.g. after navigation
+
+            :param url: url of page elements will be cached for, if known
+        """
+        self._elements.clear()
+        self._url = url
+
+    def stats(self):
+        """
+        :return: dictionary with cache hits, misses and stale elements count
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'stale': self.stale}
@@ -0,0 +1,22 @@
+"""State of many elements checked with one script call
+
+usage: probe_elements(driver, [(By.ID, 'name'), (By.ID, 'save')])
+       -> [ElementState(found=True, displayed=True, enabled=True, selected=False), ...]
+
+"""
+
+from collections import namedtuple
+from lib.browserScripts import PROBE_ELEMENTS
+
+ElementState = namedtuple('ElementState', ['found', 'displayed', 'enabled', 'selected'])
+
+
+def probe_elements(driver, selectors):
+    """Check if elements are present, displayed, enabled and selected (checked) in one round-trip
+
+        :param driver: webdriver
+        :param selectors: list of tuples (eg. By.ID, 'element/id')
+        :return: list of ElementState in selectors order
+    """
+    states = driver.execute_script(PROBE_ELEMENTS, [list(selector) for selector in selectors])
+    return [ElementState(*state) for state in states]
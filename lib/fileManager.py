@@ -1,9 +1,36 @@
 import os
 import csv
+import copy
 import json
+import mmap
+import threading
+from collections import OrderedDict
 
 test_data_directory = os.path.join(os.path.abspath(os.path.dirname(os.path.dirname(__file__))), 'test_suites/')
 
+CACHE_SIZE = 32
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cached(kind, filename, load):
+    """Return parsed file from LRU cache, file is parsed again when its modification time changed"""
+    key = (kind, os.path.abspath(filename))
+    mtime = os.path.getmtime(filename)
+    with _cache_lock:
+        if key in _cache and _cache[key][0] == mtime:
+            _cache.move_to_end(key)
+            return _cache[key][1]
+    data = load(filename)
+    with _cache_lock:
+        _cache[key] = (mtime, data)
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return data
+
 
 class FileManager(object):
     def __init__(self):
@@ -30,30 +57,94 @@ class FileManager(object):
         return data
 
     def load_data_from_csv_file(self, filename):
-        """load data from file
+        """load data from file. Parsed file is cached until it is modified.
 
         :param filename: path to file
         :return: data from csv file in dictionary format
         """
         self.check_if_file_exists(filename)
-        with open(filename, mode='r') as f:
-            reader = csv.reader(f)
-            dictionary = {}
-            for row in reader:
-                key = row[1]
-                dictionary[key] = str(row[2])
+        return dict(_cached('csv', filename, self.__parse_csv_file))
+
+    def __parse_csv_file(self, filename):
+        dictionary = {}
+        for row in csv.reader(self.iter_lines(filename)):
+            key = row[1]
+            dictionary[key] = str(row[2])
         return dictionary
 
     @staticmethod
     def load_data_from_json_file(filename):
-        """Load data from json file
+        """Load data from json file. Parsed file is cached until it is modified.
 
         :param filename: path to file
         :return: data from json in dictionary format
         """
+        return copy.deepcopy(_cached('json', filename, FileManager.__parse_json_file))
+
+    @staticmethod
+    def __parse_json_file(filename):
         with open(filename, 'r') as fp:
-            data = json.load(fp)
-            return dict(data)
+            return dict(json.load(fp))
+
+    @staticmethod
+    def iter_lines(filename):
+        """Read text file line by line. Files bigger than MMAP_THRESHOLD are read with mmap.
+
+        :param filename: path to file
+        :return: generator of lines
+        """
+        if os.path.getsize(filename) < MMAP_THRESHOLD:
+            with open(filename, mode='r', newline='') as f:
+                for line in f:
+                    yield line
+            return
+        with open(filename, mode='rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for line in iter(mapped.readline, b''):
+                    yield line.decode('utf-8')
+
+    def iter_data_from_csv_file(self, filename, header=True):
+        """Stream rows from csv file without loading whole file to memory
+
+        :param filename: path to file
+        :param header: if True first row is header and rows are dictionaries {column: value}
+        :return: generator of rows
+        """
+        self.check_if_file_exists(filename)
+        lines = self.iter_lines(filename)
+        reader = csv.DictReader(lines) if header else csv.reader(lines)
+        for row in reader:
+            yield row
+
+    def iter_data_from_json_lines_file(self, filename):
+        """Stream records from json lines file (one json document in every line)
+
+        :param filename: path to file
+        :return: generator of records
+        """
+        self.check_if_file_exists(filename)
+        for line in self.iter_lines(filename):
+            if line.strip():
+                yield json.loads(line)
+
+    def iter_test_data(self, filename):
+        """Stream test data records from file located in test_suites/ directory.
+        Csv files (with header) and json lines files are read lazily, json file has to be a list of records.
+
+        :param filename: string file name with csv, jsonl or json extension e.g 'test_data.csv'
+        :return: generator of records
+        """
+        file = os.path.join(self.test_data_directory, filename)
+        extension = os.path.splitext(filename)[1].lower()
+        if extension == '.csv':
+            return self.iter_data_from_csv_file(file)
+        if extension == '.jsonl':
+            return self.iter_data_from_json_lines_file(file)
+        if extension == '.json':
+            self.check_if_file_exists(file)
+            with open(file, 'r') as fp:
+                return iter(json.load(fp))
+        raise ValueError('Unsupported test data file: %s, use csv, jsonl or json file' % filename)
 
     def load_test_data_from_json_file(self, filename):
         """load test data for testing from file located in test_suites/ directory
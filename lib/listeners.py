@@ -1,11 +1,19 @@
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
 from selenium.webdriver.support.events import AbstractEventListener
-from lib.driverCommands import DriverCommands
+from lib.artifacts import get_artifact_collector
+
+# raised while waits poll for element or commands retry lookup, not test failures
+EXPECTED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
 
 
 class Listerers(AbstractEventListener):
-    def __init__(self, test_class):
-        self.test_class = test_class
+    def __init__(self, test):
+        """
+        :param test: running test case
+        """
+        self.test = test
 
     def on_exception(self, exception, driver):
-        name = self.test_class['_testMethodName']
-        DriverCommands(driver).get_screenshot_file(driver, name)
+        if isinstance(exception, EXPECTED_EXCEPTIONS):
+            return
+        get_artifact_collector().capture(driver, self.test.id())
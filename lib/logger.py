@@ -1,48 +1,161 @@
 """Class for logging
 
-usage: Logger.logeer('INFO', 'Some logs')
+usage: Logger.logger('INFO', 'Some logs %s', value)
+
+Messages are formatted only when level is enabled. Records are put on queue and
+written by QueueListener thread, so test thread doesn't wait for I/O (queue is
+bounded by LOG_QUEUE_SIZE, full queue blocks caller). Forked worker process
+starts its own listener. Every
+record has worker (SELENIUM_WORKER_ID environment variable or process id) and
+test (set by set_test_id) fields. LOG_FORMAT 'json' in config writes json lines.
 
 """
 
+import os
+import sys
+import json
+import queue
+import atexit
 import logging
-import inspect
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from lib.configurationReader import load_configuration_from_file
+
+CONFIG = load_configuration_from_file('connect_config.json')
+
+FORMAT = '%(asctime)s - %(levelname)s - %(worker)s - %(test)s: %(message)s'
+LEVELS = {
+    'INFO': logging.INFO,
+    'DEBUG': logging.DEBUG,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR,
+    'CRITICAL': logging.CRITICAL,
+}
+
+_context = threading.local()
+_listener = None
+_queue_handler = None
+_lock = threading.Lock()
+
+
+def worker_id():
+    return os.environ.get('SELENIUM_WORKER_ID') or str(os.getpid())
+
+
+class BlockingQueueHandler(QueueHandler):
+    """Waits for free place in bounded queue instead of dropping record"""
+
+    def enqueue(self, record):
+        self.queue.put(record)
+
+
+class ContextFilter(logging.Filter):
+    """Adds worker and test ids to log record"""
+
+    def filter(self, record):
+        record.worker = worker_id()
+        record.test = getattr(_context, 'test', '-')
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        data = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'worker': getattr(record, 'worker', worker_id()),
+            'test': getattr(record, 'test', '-'),
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            data['exception'] = self.formatException(record.exc_info)
+        return json.dumps(data)
+
+
+def configure_logging():
+    """Set root logger to send records through queue to listener thread. Runs once per process."""
+    global _listener, _queue_handler
+    with _lock:
+        if _listener is not None:
+            return
+        if CONFIG.get('LOG_FILE'):
+            handler = logging.FileHandler(CONFIG['LOG_FILE'])
+        else:
+            handler = logging.StreamHandler()
+        if CONFIG.get('LOG_FORMAT') == 'json':
+            handler.setFormatter(JsonFormatter())
+        else:
+            handler.setFormatter(logging.Formatter(FORMAT))
+        _queue_handler = BlockingQueueHandler(queue.Queue(CONFIG.get('LOG_QUEUE_SIZE', 10000)))
+        _queue_handler.addFilter(ContextFilter())
+        root = logging.getLogger()
+        root.setLevel(LEVELS[CONFIG.get('LOG_LEVEL', 'INFO').upper()])
+        root.addHandler(_queue_handler)
+        _listener = QueueListener(_queue_handler.queue, handler)
+        _listener.start()
+        atexit.register(_stop_listener, _listener)
+
+
+def _stop_listener(listener):
+    if listener is _listener:
+        listener.stop()
+
+
+def _reset_after_fork():
+    # listener thread of parent doesn't exist in child process, child starts its own
+    global _listener, _queue_handler, _lock
+    _lock = threading.Lock()
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+    _listener = None
+    _queue_handler = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def set_test_id(test_id):
+    """Mark next log records of current thread with test id
+
+        :param test_id: e.g. test method name
+    """
+    _context.test = test_id
 
 
 class Logger(object):
     def __init__(self):
-        self.FORMAT = '%(asctime)s - %(levelname)s: %(message)s'
-        self.format = logging.basicConfig(
-            filename=None,
-            level=logging.INFO,
-            format=self.FORMAT)
+        self.FORMAT = FORMAT
+        configure_logging()
 
     @staticmethod
     def logger(level, *msg):
         """
 
         :param level: logs level - string - can be: 'INFO', 'DEBUG', 'WARNING', 'ERROR', 'CRITICAL'
-        :param msg: your logs
+        :param msg: your logs - message with %s placeholders followed by its arguments,
+            formatted only if level is enabled
         """
-        level = level.upper()
-        if level == 'INFO':
-            logging.info(msg)
-        elif level == 'DEBUG':
-            logging.debug(msg)
-        elif level == 'WARNING':
-            logging.warning(msg)
-        elif level == 'ERROR':
-            logging.error(msg)
-        elif level == 'CRITICAL':
-            logging.critical(msg)
+        level_no = LEVELS.get(level.upper())
+        if level_no is None:
+            raise ValueError('Unknown log level %s, available: INFO, WARNING, DEBUG, ERROR, CRITICAL' % level)
+        configure_logging()
+        root = logging.getLogger()
+        if not root.isEnabledFor(level_no):
+            return
+        if len(msg) > 1 and isinstance(msg[0], str):
+            root.log(level_no, msg[0], *msg[1:])
+        elif len(msg) == 1:
+            root.log(level_no, msg[0])
         else:
-            raise ValueError('Unknown log level %s, available: INFO, WARNING, DEBUG, ERROR, CRITICAL' % msg)
+            root.log(level_no, msg)
 
 
 def whoami():
     """
     prints current function name in runtime
     """
-    name = inspect.stack()[1][3]
+    name = sys._getframe(1).f_code.co_name
     print('-' * 42 + '-' * len(name))
     print('*' * 20, name, '*' * 20)
     print('-' * 42 + '-' * len(name))
@@ -0,0 +1,214 @@
+"""Browser-level stub of fetch and XMLHttpRequest
+
+Configured by NETWORK_MOCK in config:
+* MODE - 'off', 'record' (responses are saved to RECORDINGS_FILE) or 'replay'
+  (recorded responses are served without calling backend, other requests go to network)
+* RECORDINGS_FILE - json file with recordings keyed by 'METHOD url body'
+* BLOCK - url fragments of requests which are blocked e.g. analytics, fonts, ads
+* LATENCY_MS - delay added to every request, for performance tests
+
+Chrome gets stub by DevTools (Page.addScriptToEvaluateOnNewDocument), so it is
+active before page scripts run on every page, and blocked urls are blocked for
+all resources (Network.setBlockedURLs). Other browsers get stub injected by
+DriverCommands.open_url right after driver.get returns, before waiting for ready
+element, so only requests sent by page during loading are not mocked.
+
+"""
+
+import os
+import json
+import atexit
+from selenium.common.exceptions import WebDriverException
+from lib.configurationReader import load_configuration_from_file
+from lib.fileManager import FileManager
+from lib.logger import Logger
+
+CONFIG = load_configuration_from_file('connect_config.json')
+
+RECORDINGS_FILE = os.path.join(os.path.abspath(os.path.dirname(os.path.dirname(__file__))), 'test_suites',
+                               'network_recordings.json')
+
+STUB_SCRIPT = """
+(function (settings) {
+    if (window.__networkMock) { return; }
+    var mock = window.__networkMock = {recorded: {}};
+
+    function absolute(url) {
+        return new URL(url, window.location.href).href;
+    }
+    function key(method, url, body) {
+        return method.toUpperCase() + ' ' + absolute(url) + ' ' + (typeof body === 'string' ? body : '');
+    }
+    function blocked(url) {
+        return settings.block.some(function (fragment) { return url.indexOf(fragment) !== -1; });
+    }
+    function delay() {
+        return new Promise(function (resolve) { setTimeout(resolve, settings.latency); });
+    }
+
+    var originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function (input, init) {
+            var args = arguments, self = this;
+            var url = absolute(typeof input === 'string' ? input : input.url);
+            var method = (init && init.method) || (typeof input === 'string' ? 'GET' : input.method);
+            var requestKey = key(method, url, init && init.body);
+            return delay().then(function () {
+                if (blocked(url)) {
+                    throw new TypeError('Request blocked by network mock: ' + url);
+                }
+                var recording = settings.mode === 'replay' && settings.recordings[requestKey];
+                if (recording) {
+                    return new Response(recording.body, {status: recording.status, headers: recording.headers});
+                }
+                return originalFetch.apply(self, args).then(function (response) {
+                    if (settings.mode === 'record') {
+                        response.clone().text().then(function (body) {
+                            mock.recorded[requestKey] = {status: response.status, body: body,
+                                headers: {'content-type': response.headers.get('content-type') || ''}};
+                        });
+                    }
+                    return response;
+                });
+            });
+        };
+    }
+
+    var open = XMLHttpRequest.prototype.open;
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.__mockRequest = {method: method, url: absolute(url)};
+        return open.apply(this, arguments);
+    };
+    XMLHttpRequest.prototype.send = function (body) {
+        var xhr = this, request = xhr.__mockRequest || {method: 'GET', url: ''};
+        var requestKey = key(request.method, request.url, body);
+        var recording = settings.mode === 'replay' && settings.recordings[requestKey];
+        function respond() {
+            if (blocked(request.url)) {
+                ['error', 'loadend'].forEach(function (type) { xhr.dispatchEvent(new ProgressEvent(type)); });
+                return;
+            }
+            if (recording) {
+                var values = {readyState: 4, status: recording.status, statusText: 'OK',
+                              responseText: recording.body, response: recording.body, responseURL: request.url};
+                Object.keys(values).forEach(function (name) {
+                    Object.defineProperty(xhr, name, {value: values[name], configurable: true});
+                });
+                var headers = recording.headers || {};
+                xhr.getResponseHeader = function (name) {
+                    var found = Object.keys(headers).filter(function (header) {
+                        return header.toLowerCase() === name.toLowerCase();
+                    })[0];
+                    return found === undefined ? null : headers[found];
+                };
+                xhr.getAllResponseHeaders = function () {
+                    return Object.keys(headers).map(function (header) {
+                        return header.toLowerCase() + ': ' + headers[header] + '\\r\\n';
+                    }).join('');
+                };
+                ['readystatechange', 'load', 'loadend'].forEach(function (type) {
+                    xhr.dispatchEvent(type === 'readystatechange' ? new Event(type) : new ProgressEvent(type));
+                });
+                return;
+            }
+            if (settings.mode === 'record') {
+                xhr.addEventListener('load', function () {
+                    if (xhr.responseType === '' || xhr.responseType === 'text') {
+                        mock.recorded[requestKey] = {status: xhr.status, body: xhr.responseText,
+                            headers: {'content-type': xhr.getResponseHeader('content-type') || ''}};
+                    }
+                });
+            }
+            send.call(xhr, body);
+        }
+        if (settings.latency || blocked(request.url) || recording) {
+            setTimeout(respond, settings.latency);
+        } else {
+            respond();
+        }
+    };
+})(%s);
+"""
+
+COLLECT_SCRIPT = "return window.__networkMock ? window.__networkMock.recorded : {};"
+
+log = Logger()
+
+
+class NetworkMock(object):
+    def __init__(self, settings=None):
+        """
+        :param settings: dictionary like NETWORK_MOCK in config
+        """
+        settings = settings or CONFIG.get('NETWORK_MOCK', {})
+        self.mode = settings.get('MODE', 'off')
+        self.block = list(settings.get('BLOCK', ()))
+        self.latency = settings.get('LATENCY_MS', 0)
+        self.recordings_file = settings.get('RECORDINGS_FILE') or RECORDINGS_FILE
+        self.recordings = {}
+        self._devtools_drivers = set()
+        if self.mode == 'replay' and os.path.isfile(self.recordings_file):
+            self.recordings = FileManager.load_data_from_json_file(self.recordings_file)
+        if self.mode == 'record':
+            atexit.register(self.save_recordings)
+
+    @property
+    def enabled(self):
+        return self.mode != 'off' or bool(self.block) or bool(self.latency)
+
+    def script(self):
+        settings = {'mode': self.mode, 'block': self.block, 'latency': self.latency,
+                    'recordings': self.recordings if self.mode == 'replay' else {}}
+        return STUB_SCRIPT % json.dumps(settings)
+
+    def attach(self, driver):
+        """Install stub for every next page of driver. Works with chrome DevTools, for other browsers
+        stub is installed by install() after every navigation.
+
+            :param driver: webdriver
+        """
+        if not self.enabled or not hasattr(driver, 'execute_cdp_cmd'):
+            return
+        try:
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': self.script()})
+            if self.block:
+                driver.execute_cdp_cmd('Network.enable', {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs',
+                                       {'urls': ['*%s*' % fragment for fragment in self.block]})
+            self._devtools_drivers.add(id(driver))
+        except WebDriverException as e:
+            log.logger('WARNING', 'Network mock DevTools setup failed, stub will be injected by open_url: %s', e)
+
+    def install(self, driver):
+        """Inject stub to current page, if driver has no DevTools stub
+
+            :param driver: webdriver
+        """
+        if self.enabled and id(getattr(driver, 'wrapped_driver', driver)) not in self._devtools_drivers:
+            driver.execute_script(self.script())
+
+    def collect(self, driver):
+        """Take responses recorded on current page, call before leaving page
+
+            :param driver: webdriver
+        """
+        if self.mode != 'record':
+            return
+        try:
+            self.recordings.update(driver.execute_script(COLLECT_SCRIPT) or {})
+        except WebDriverException as e:
+            log.logger('WARNING', 'Network recordings not collected: %s', e)
+
+    def save_recordings(self):
+        """Save recordings to RECORDINGS_FILE"""
+        if not self.recordings:
+            return
+        directory = os.path.dirname(self.recordings_file)
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        FileManager.save_data_to_json_file(self.recordings_file, self.recordings)
+        log.logger('INFO', '%s network recordings saved', len(self.recordings))
+
+
+network_mock = NetworkMock()
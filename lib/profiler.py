@@ -0,0 +1,146 @@
+"""Profiler of time spent in webdriver commands, waits and sleeps
+
+Every measured call is attributed to current test (set in BaseTest.setUp) and
+to calls it was made from, e.g. findElement made inside wait. At process exit
+profile is saved to PROFILING_DIR:
+* profile.json - totals per test and top slow commands
+* profile.collapsed - collapsed stacks for flame graph tools (flamegraph.pl, speedscope)
+
+usage:
+    profiler.instrument_driver(driver)
+    with profiler.measure('sleep', '5 sec'):
+        time.sleep(5)
+
+"""
+
+import os
+import time
+import atexit
+import threading
+from contextlib import contextmanager
+from lib.configurationReader import load_configuration_from_file
+from lib.fileManager import FileManager
+
+CONFIG = load_configuration_from_file('connect_config.json')
+
+TOP_COMMANDS = 20
+PROFILE_DIR = os.path.join(os.path.abspath(os.path.dirname(os.path.dirname(__file__))), 'profile')
+
+
+class Profiler(object):
+    def __init__(self):
+        self.enabled = CONFIG.get('PROFILING', False)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stacks = {}
+
+    @property
+    def current_test(self):
+        return getattr(self._local, 'test', 'no_test')
+
+    def start_test(self, test_name):
+        """Attribute next measured calls of current thread to test
+
+            :param test_name: e.g. 'SampleTest;test_01_add'
+        """
+        self._local.test = test_name
+
+    @contextmanager
+    def measure(self, kind, name):
+        """Measure time of code block
+
+            :param kind: 'command', 'script', 'wait' or 'sleep'
+            :param name: command name with details e.g. selector
+        """
+        if not self.enabled:
+            yield
+            return
+        stack = self.__stack()
+        # ';' separates frames in collapsed stack format
+        frame = {'name': ('%s %s' % (kind, name)).replace(';', ','), 'children': 0.0}
+        stack.append(frame)
+        start = time.time()
+        try:
+            yield
+        finally:
+            elapsed = time.time() - start
+            stack.pop()
+            if stack:
+                stack[-1]['children'] += elapsed
+            path = ';'.join([self.current_test] + [f['name'] for f in stack] + [frame['name']])
+            self.__record(kind, name, path, elapsed, elapsed - frame['children'])
+
+    def instrument_driver(self, driver):
+        """Wrap driver.execute, so every webdriver command sent by driver is measured
+
+            :param driver: webdriver
+            :return: driver
+        """
+        execute = driver.execute
+
+        def timed_execute(driver_command, params=None):
+            with self.measure(*self.__describe(driver_command, params)):
+                return execute(driver_command, params)
+        driver.execute = timed_execute
+        return driver
+
+    def report(self):
+        """Profile data
+
+            :return: dictionary with 'tests' totals and 'top' slowest calls
+        """
+        with self._lock:
+            calls = list(self._calls.items())
+        tests = {}
+        for (test, kind, name), call in calls:
+            totals = tests.setdefault(test, {})
+            totals[kind] = round(totals.get(kind, 0.0) + call['total'], 3)
+        top = sorted(calls, key=lambda item: item[1]['total'], reverse=True)[:TOP_COMMANDS]
+        return {
+            'tests': tests,
+            'top': [{'test': test, 'kind': kind, 'name': name, 'count': call['count'],
+                     'total': round(call['total'], 3), 'max': round(call['max'], 3)}
+                    for (test, kind, name), call in top],
+        }
+
+    def dump(self, directory):
+        """Save profile.json and profile.collapsed files
+
+            :param directory: path to output directory
+        """
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        FileManager.save_data_to_json_file(os.path.join(directory, 'profile.json'), self.report())
+        with self._lock:
+            stacks = sorted(self._stacks.items())
+        with open(os.path.join(directory, 'profile.collapsed'), 'w') as fp:
+            for path, self_time in stacks:
+                fp.write('%s %d\n' % (path.replace(' ', '_'), self_time * 1000000))
+
+    def __stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def __record(self, kind, name, path, elapsed, self_time):
+        with self._lock:
+            call = self._calls.setdefault((self.current_test, kind, name), {'count': 0, 'total': 0.0, 'max': 0.0})
+            call['count'] += 1
+            call['total'] += elapsed
+            call['max'] = max(call['max'], elapsed)
+            self._stacks[path] = self._stacks.get(path, 0.0) + self_time
+
+    @staticmethod
+    def __describe(driver_command, params):
+        params = params or {}
+        if 'script' in params:
+            return 'script', ' '.join(params['script'].split())[:60]
+        if 'using' in params:
+            return 'command', '%s %s=%s' % (driver_command, params['using'], params.get('value'))
+        return 'command', driver_command
+
+
+profiler = Profiler()
+if profiler.enabled:
+    atexit.register(profiler.dump, CONFIG.get('PROFILING_DIR') or PROFILE_DIR)
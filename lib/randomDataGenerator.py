@@ -3,9 +3,32 @@ import random
 import string
 from datetime import datetime
 from lib.fileManager import FileManager
+from lib.configurationReader import load_configuration_from_file
+
+CONFIG = load_configuration_from_file('connect_config.json')
 
 log = Logger()
 
+_random = random.Random()
+
+
+def seed_random(seed=None):
+    """
+    Set seed of random data generator. Same seed generates same data, so failed run can be replayed.
+    :param seed: int seed, new random seed is generated if None
+    :return: used seed
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    _random.seed(seed)
+    log.logger('INFO', 'Random data seed: %s', seed)
+    return seed
+
+
+def _class_attr_values(classinstance):
+    return {key: value for key, value in classinstance.__dict__.items() if
+            not key.startswith('_') and not callable(value) and not type(value) == staticmethod}
+
 
 def generate_class_attr_dict(classinstance):
     """
@@ -13,17 +36,33 @@ def generate_class_attr_dict(classinstance):
     :param classinstance: Class or class instance
     :return: dictionary
     """
-    values = {key: value for key, value in classinstance.__dict__.items() if
-              not key.startswith('_') and not callable(value) and not type(value) == staticmethod}
+    values = _class_attr_values(classinstance)
     attr_dict = {}
     for value in values:
         if type(values[value]) is list:
-            attr_dict[value] = random.choice(values[value])
+            attr_dict[value] = _random.choice(values[value])
         else:
             attr_dict[value] = values[value]
     return attr_dict
 
 
+def iter_class_attr_dicts(classinstance, count):
+    """
+    Function yields dictionaries like generate_class_attr_dict. Class attributes are read only once.
+    :param classinstance: Class or class instance
+    :param count: number of dictionaries
+    :return: generator of dictionaries
+    """
+    values = _class_attr_values(classinstance)
+    fixed = {key: value for key, value in values.items() if type(value) is not list}
+    choices = [(key, value) for key, value in values.items() if type(value) is list]
+    for _ in range(count):
+        attr_dict = dict(fixed)
+        for key, value in choices:
+            attr_dict[key] = _random.choice(value)
+        yield attr_dict
+
+
 def generate_test_data_json(classinstance, file_name):
     """
     Function saves generated dictionary to json file in test_suite/ directory
@@ -42,10 +81,10 @@ def random_string(length, upper=True):
     :return: string
     """
     if upper:
-        word = ''.join(random.choice(string.ascii_uppercase) for _ in range(length))
+        word = ''.join(_random.choices(string.ascii_uppercase, k=length))
     else:
-        word = ''.join(random.choice(string.ascii_lowercase) for _ in range(length))
-    log.logger('DEBUG', 'random string %s generated' % word)
+        word = ''.join(_random.choices(string.ascii_lowercase, k=length))
+    log.logger('DEBUG', 'random string %s generated', word)
     return word
 
 
@@ -55,8 +94,8 @@ def random_digits(length):
     :param length: string length
     :return: string
     """
-    word = ''.join(random.choice(string.digits) for _ in range(length))
-    log.logger('DEBUG', 'random string digits %s generated' % word)
+    word = ''.join(_random.choices(string.digits, k=length))
+    log.logger('DEBUG', 'random string digits %s generated', word)
     if word.startswith('0'):
         word = word.replace('0', '1')
     return word
@@ -69,7 +108,7 @@ def random_currency(mini, maxi):
     :param maxi: int - maximal value
     :return: str - value in format XX.XX
     """
-    return str(format(random.uniform(mini, maxi), '.2f'))
+    return str(format(_random.uniform(mini, maxi), '.2f'))
 
 
 def random_chars_digits(length, upper=True):
@@ -80,13 +119,60 @@ def random_chars_digits(length, upper=True):
     :return: string
     """
     if upper:
-        word = ''.join(random.choice(string.ascii_uppercase + string.digits) for _ in range(length))
+        word = ''.join(_random.choices(string.ascii_uppercase + string.digits, k=length))
     else:
-        word = ''.join(random.choice(string.ascii_lowercase + string.digits) for _ in range(length))
-    log.logger('DEBUG', 'random string with letters and digits generated: %s' % word)
+        word = ''.join(_random.choices(string.ascii_lowercase + string.digits, k=length))
+    log.logger('DEBUG', 'random string with letters and digits generated: %s', word)
     return word
 
 
+def _random_batch(count, length, chars):
+    if length == 0:
+        return [''] * count
+    text = ''.join(_random.choices(chars, k=count * length))
+    return [text[i:i + length] for i in range(0, count * length, length)]
+
+
+def random_strings(count, length, upper=True):
+    """ Generates list of random strings with only ascii letters
+
+    :param count: number of strings
+    :param length: string len
+    :param upper: default True, set False if you want have strings in lowercase format
+    :return: list of strings
+    """
+    words = _random_batch(count, length, string.ascii_uppercase if upper else string.ascii_lowercase)
+    log.logger('DEBUG', '%s random strings generated', count)
+    return words
+
+
+def random_digits_strings(count, length):
+    """ Generates list of random strings with digits only. Strings don't start with 0 (like random_digits).
+
+    :param count: number of strings
+    :param length: string length
+    :return: list of strings
+    """
+    words = [word.replace('0', '1') if word.startswith('0') else word
+             for word in _random_batch(count, length, string.digits)]
+    log.logger('DEBUG', '%s random digits strings generated', count)
+    return words
+
+
+def random_chars_digits_strings(count, length, upper=True):
+    """ Generates list of random strings with letters and digits
+
+    :param count: number of strings
+    :param length: string length
+    :param upper: default True, set False if you want have lowercase format
+    :return: list of strings
+    """
+    letters = string.ascii_uppercase if upper else string.ascii_lowercase
+    words = _random_batch(count, length, letters + string.digits)
+    log.logger('DEBUG', '%s random strings with letters and digits generated', count)
+    return words
+
+
 def get_date_without_space():
     """
     Generates string with current date and time in format YearMonthDayHourMinuteSecondsMilisec
@@ -95,3 +181,6 @@ def get_date_without_space():
     data_print = datetime.now()
     data_formatted = str(data_print.strftime('%Y%m%d%H%M%S%f'))
     return data_formatted
+
+
+seed_random(CONFIG.get('RANDOM_SEED'))
@@ -1,24 +1,131 @@
+"""HTTP requests used to prepare test data through API
+
+Requests are sent with pooled keep-alive session with timeout and retries set
+by REQUEST_TIMEOUT, REQUEST_RETRIES and REQUEST_POOL_SIZE in config.
+
+Async methods are thread-backed: requests is blocking, so every request is sent
+by executor thread and awaited in asyncio loop. At most REQUEST_CONCURRENCY
+requests are in flight, connection pool keeps that many connections alive.
+
+usage:
+    RequestManager.post_request(url, name='test')
+    RequestManager().post_requests(url, [{'name': 'a'}, {'name': 'b'}])
+
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from lib.logger import Logger
+from lib.configurationReader import load_configuration_from_file
+
+CONFIG = load_configuration_from_file('connect_config.json')
 
 log = Logger
 
+_default_manager = None
+
 
 class RequestManager(object):
+    def __init__(self, timeout=None, retries=None, pool_size=None, concurrency=None):
+        """
+        :param timeout: request timeout in seconds, default REQUEST_TIMEOUT from config
+        :param retries: retries of failed connections (and 5xx responses of idempotent requests),
+            default REQUEST_RETRIES
+        :param pool_size: connections kept alive per host, default REQUEST_POOL_SIZE,
+            raised to concurrency if lower
+        :param concurrency: max requests in flight of async and bulk methods (executor threads),
+            default REQUEST_CONCURRENCY
+        """
+        self.timeout = timeout or CONFIG.get('REQUEST_TIMEOUT', 30)
+        self.retries = retries if retries is not None else CONFIG.get('REQUEST_RETRIES', 3)
+        self.concurrency = concurrency or CONFIG.get('REQUEST_CONCURRENCY', 100)
+        self.pool_size = max(pool_size or CONFIG.get('REQUEST_POOL_SIZE', 10), self.concurrency)
+        self.session = self.create_session(self.retries, self.pool_size)
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency)
+
+    @staticmethod
+    def create_session(retries, pool_size):
+        """Create requests session with connection pool and retries
+
+            :param retries: number of retries
+            :param pool_size: connection pool size
+            :return: requests.Session
+        """
+        retry = Retry(total=retries, backoff_factor=0.2, status_forcelist=(502, 503, 504), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def post(self, url, **payload):
+        r = self.session.post(url, payload, timeout=self.timeout)
+        log.logger("INFO", 'POST Request sent. URL: %s, payload: %s', url, payload)
+        return self.__response(r)
+
+    def get(self, url, **payload):
+        r = self.session.get(url, params=payload, timeout=self.timeout)
+        log.logger("INFO", 'GET Request sent. URL: %s, payload: %s', url, payload)
+        return self.__response(r)
+
+    async def post_async(self, url, **payload):
+        """POST request awaitable in asyncio loop, sent by executor thread with pooled session"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, lambda: self.post(url, **payload))
+
+    async def get_async(self, url, **payload):
+        """GET request awaitable in asyncio loop, sent by executor thread with pooled session"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, lambda: self.get(url, **payload))
+
+    async def post_requests_async(self, url, payloads):
+        """Send POST requests for all payloads concurrently
+
+            :param url: url
+            :param payloads: list of dictionaries
+            :return: list of responses in payloads order
+        """
+        return await asyncio.gather(*[self.post_async(url, **payload) for payload in payloads])
+
+    def post_requests(self, url, payloads):
+        """Send POST requests for all payloads concurrently and wait for all responses.
+        Can be called also from running asyncio loop (use post_requests_async there to not block it).
+
+            :param url: url
+            :param payloads: list of dictionaries
+            :return: list of responses in payloads order
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.post_requests_async(url, payloads))
+        return list(self.executor.map(lambda payload: self.post(url, **payload), payloads))
+
+    def close(self):
+        self.executor.shutdown()
+        self.session.close()
+
+    @staticmethod
+    def default():
+        """Manager shared by post_request/get_request calls"""
+        global _default_manager
+        if _default_manager is None:
+            _default_manager = RequestManager()
+        return _default_manager
 
     @staticmethod
     def post_request(url, **payload):
-        r = requests.post(url, payload)
-        log.logger("INFO", 'POST Request sent. URL: %s, payload: %s' % (url, payload))
-        resp = {"response": r.json(), "code": r.status_code}
-        log.logger('INFO', resp)
-        return resp
+        return RequestManager.default().post(url, **payload)
 
     @staticmethod
     def get_request(url, **payload):
-        r = requests.get(url, payload)
-        log.logger("INFO", 'GET Request sent. URL: %s, payload: %s' % (url, payload))
+        return RequestManager.default().get(url, **payload)
+
+    @staticmethod
+    def __response(r):
         resp = {"response": r.json(), "code": r.status_code}
         log.logger('INFO', resp)
         return resp
-
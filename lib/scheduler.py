@@ -0,0 +1,299 @@
+"""Duration balanced test sharding
+
+BaseTest records duration of every test class and test method in timing
+database (TIMINGS_FILE in config, default timings.json). Scheduler splits test
+classes into shards with balanced predicted time. Test class is never split,
+because setUpClass owns the driver. Classes in shard are run slowest first.
+Shards running in parallel merge their timings to the file under file lock.
+
+usage:
+    python -m lib.scheduler run --shard 0 --shards 4 --results results/shard_0.json [--config KEY=VALUE] [tests]
+    python -m lib.scheduler merge results/shard_*.json --output results/all.json
+
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import argparse
+import threading
+import unittest
+from contextlib import contextmanager
+from lib.configurationReader import load_configuration_from_file, apply_cli_overrides
+from lib.fileManager import FileManager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+PROJECT_DIR = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+DEFAULT_DURATION = 60.0
+SMOOTHING = 0.5
+
+
+@contextmanager
+def file_lock(filename):
+    """Exclusive lock of <filename>.lock shared by processes
+
+        :param filename: path of locked file
+    """
+    with open(filename + '.lock', 'a+') as fp:
+        if fcntl:
+            fcntl.flock(fp, fcntl.LOCK_EX)
+        else:
+            fp.seek(0)
+            msvcrt.locking(fp.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(fp, fcntl.LOCK_UN)
+            else:
+                fp.seek(0)
+                msvcrt.locking(fp.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class TimingDatabase(object):
+    def __init__(self, filename=None):
+        """
+        :param filename: path to json file, default TIMINGS_FILE from config or timings.json in project directory
+        """
+        config = load_configuration_from_file('connect_config.json')
+        self.filename = filename or config.get('TIMINGS_FILE') or os.path.join(PROJECT_DIR, 'timings.json')
+        self._lock = threading.Lock()
+        self._updates = {}
+        self.timings = self.__load()
+
+    def record_class(self, class_id, duration):
+        """Save duration of whole test class (setUpClass, tests, tearDownClass)
+
+            :param class_id: 'module.ClassName'
+            :param duration: time in seconds
+        """
+        with self._lock:
+            self._updates.setdefault(class_id, {'methods': {}})['duration'] = duration
+
+    def record_method(self, class_id, method_name, duration):
+        """Save duration of single test
+
+            :param class_id: 'module.ClassName'
+            :param method_name: test method name
+            :param duration: time in seconds
+        """
+        with self._lock:
+            self._updates.setdefault(class_id, {'methods': {}})['methods'][method_name] = duration
+
+    def predict(self, class_id, method_names=()):
+        """Predicted duration of test class
+
+            :param class_id: 'module.ClassName'
+            :param method_names: methods to run, used when class duration is unknown
+            :return: time in seconds
+        """
+        timing = self.timings.get(class_id)
+        if timing and timing.get('duration') is not None:
+            return timing['duration']
+        methods = timing['methods'] if timing else {}
+        known = [methods[name] for name in method_names if name in methods]
+        if known:
+            return sum(known) + self.__average_method() * (len(method_names) - len(known))
+        return DEFAULT_DURATION
+
+    def save(self):
+        """Merge recorded durations to database file. Previous values are smoothed with new ones."""
+        with self._lock:
+            updates, self._updates = self._updates, {}
+        if not updates:
+            return
+        directory = os.path.dirname(self.filename)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with file_lock(self.filename):
+            timings = self.__load()
+            for class_id, update in updates.items():
+                timing = timings.setdefault(class_id, {'duration': None, 'methods': {}})
+                if 'duration' in update:
+                    timing['duration'] = self.__smooth(timing['duration'], update['duration'])
+                for name, duration in update['methods'].items():
+                    timing['methods'][name] = self.__smooth(timing['methods'].get(name), duration)
+            temp_file = '%s.%s.tmp' % (self.filename, os.getpid())
+            FileManager.save_data_to_json_file(temp_file, timings)
+            os.replace(temp_file, self.filename)
+        self.timings = timings
+
+    def __load(self):
+        if not os.path.isfile(self.filename):
+            return {}
+        with open(self.filename, 'r') as fp:
+            return json.load(fp)
+
+    def __average_method(self):
+        durations = [d for timing in self.timings.values() for d in timing['methods'].values()]
+        return sum(durations) / len(durations) if durations else DEFAULT_DURATION
+
+    @staticmethod
+    def __smooth(previous, duration):
+        if previous is None:
+            return round(duration, 3)
+        return round(previous * (1 - SMOOTHING) + duration * SMOOTHING, 3)
+
+
+_timing_database = None
+
+
+def get_timing_database():
+    """Timing database of current process, saved at process exit"""
+    global _timing_database
+    if _timing_database is None:
+        _timing_database = TimingDatabase()
+        atexit.register(_timing_database.save)
+    return _timing_database
+
+
+def class_id(test_class):
+    return '%s.%s' % (test_class.__module__, test_class.__name__)
+
+
+def group_by_class(suite):
+    """Flatten test suite to ordered dictionary {class id: [tests]}"""
+    groups = {}
+    for test in _iter_tests(suite):
+        groups.setdefault(class_id(test.__class__), []).append(test)
+    return groups
+
+
+def split_into_shards(groups, shards, timings):
+    """Split test classes into shards with balanced predicted time. Longest class goes
+    to least loaded shard first. Classes in every shard are sorted slowest first.
+
+        :param groups: dictionary {class id: [tests]}
+        :param shards: number of shards
+        :param timings: TimingDatabase
+        :return: list of shards, every shard is list of (class id, predicted time) tuples
+    """
+    predicted = {name: timings.predict(name, [t._testMethodName for t in tests]) for name, tests in groups.items()}
+    result = [[] for _ in range(shards)]
+    loads = [0.0] * shards
+    for name in sorted(predicted, key=lambda n: (-predicted[n], n)):
+        shard = loads.index(min(loads))
+        loads[shard] += predicted[name]
+        result[shard].append((name, predicted[name]))
+    return result
+
+
+class ShardResult(unittest.TextTestResult):
+    """Test result which keeps outcome and duration of every test"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.outcomes = {}
+        self._started = {}
+
+    def startTest(self, test):
+        self._started[test.id()] = time.time()
+        super().startTest(test)
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        outcome = self.outcomes.setdefault(test.id(), {'outcome': 'success'})
+        outcome['duration'] = round(time.time() - self._started.get(test.id(), time.time()), 3)
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self.outcomes[test.id()] = {'outcome': 'error', 'message': self._exc_info_to_string(err, test)}
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self.outcomes[test.id()] = {'outcome': 'failure', 'message': self._exc_info_to_string(err, test)}
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self.outcomes[test.id()] = {'outcome': 'skipped', 'message': reason}
+
+
+def run_shard(start_dir, shard, shards, results_file=None, pattern='*test*.py'):
+    """Discover tests, run classes of one shard and save results
+
+        :param start_dir: tests directory
+        :param shard: shard number counted from 0
+        :param shards: number of shards
+        :param results_file: path to json results file
+        :return: True if all tests passed
+    """
+    suite = unittest.TestLoader().discover(start_dir, pattern=pattern, top_level_dir=PROJECT_DIR)
+    groups = group_by_class(suite)
+    plan = split_into_shards(groups, shards, get_timing_database())[shard]
+    print('Shard %s/%s: %s test classes, predicted %.1f s' % (shard, shards, len(plan),
+                                                           sum(predicted for _, predicted in plan)))
+    shard_suite = unittest.TestSuite()
+    for name, _ in plan:
+        shard_suite.addTests(groups[name])
+    start = time.time()
+    result = unittest.TextTestRunner(resultclass=ShardResult, verbosity=2).run(shard_suite)
+    if results_file:
+        directory = os.path.dirname(results_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        FileManager.save_data_to_json_file(results_file, {
+            'shard': shard, 'shards': shards, 'duration': round(time.time() - start, 3),
+            'tests': result.outcomes})
+    return result.wasSuccessful()
+
+
+def merge_results(results_files, output_file=None):
+    """Merge json results of shards
+
+        :param results_files: list of paths to shard results
+        :param output_file: path to merged json file
+        :return: merged results dictionary
+    """
+    merged = {'shards': [], 'tests': {}, 'summary': {}}
+    for results_file in results_files:
+        data = FileManager.load_data_from_json_file(results_file)
+        merged['shards'].append({'shard': data['shard'], 'duration': data['duration']})
+        merged['tests'].update(data['tests'])
+    for outcome in merged['tests'].values():
+        merged['summary'][outcome['outcome']] = merged['summary'].get(outcome['outcome'], 0) + 1
+    if output_file:
+        FileManager.save_data_to_json_file(output_file, merged)
+    return merged
+
+
+def _iter_tests(suite):
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            for inner in _iter_tests(test):
+                yield inner
+        else:
+            yield test
+
+
+def main(argv=None):
+    argv = apply_cli_overrides(sys.argv[1:] if argv is None else argv)
+    parser = argparse.ArgumentParser(prog='python -m lib.scheduler', description=__doc__.split('\n')[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help='run one shard of tests')
+    run.add_argument('start_dir', nargs='?', default=os.path.join(PROJECT_DIR, 'tests'))
+    run.add_argument('--shard', type=int, required=True, help='shard number counted from 0')
+    run.add_argument('--shards', type=int, required=True, help='number of shards')
+    run.add_argument('--results', help='json results file')
+    run.add_argument('--pattern', default='*test*.py', help='test file name pattern')
+    merge = commands.add_parser('merge', help='merge json results of shards')
+    merge.add_argument('results', nargs='+')
+    merge.add_argument('--output', help='merged json results file')
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        if not 0 <= args.shard < args.shards:
+            parser.error('--shard has to be between 0 and %s' % (args.shards - 1))
+        return 0 if run_shard(args.start_dir, args.shard, args.shards, args.results, args.pattern) else 1
+    merged = merge_results(args.results, args.output)
+    print(json.dumps(merged['summary']))
+    return 0 if set(merged['summary']) <= {'success', 'skipped'} else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Snapshot and restore of logged in browser session
+
+After login through UI cookies, localStorage and sessionStorage are captured
+and saved for user, BASE_URL and ENV from config. Next sessions get this state
+injected instead of logging in again. Saved state expires after
+SESSION_STATE_TTL seconds and is removed when restored session is redirected
+to LOGIN_URL. State is kept in memory and in SESSION_STATE_DIR, so it is shared
+by worker processes.
+
+usage:
+    if not session_store.restore(driver, 'user'):
+        # login through UI
+        session_store.capture(driver, 'user')
+
+"""
+
+import os
+import time
+import hashlib
+from selenium.common.exceptions import WebDriverException
+from lib.configurationReader import load_configuration_from_file
+from lib.fileManager import FileManager
+from lib.logger import Logger
+
+CONFIG = load_configuration_from_file('connect_config.json')
+
+STATE_DIR = os.path.join(os.path.abspath(os.path.dirname(os.path.dirname(__file__))), 'session_state')
+COOKIE_KEYS = ('name', 'value', 'path', 'domain', 'secure', 'httpOnly', 'expiry')
+
+CAPTURE_SCRIPT = """
+    function dump(storage) {
+        var data = {};
+        for (var i = 0; i < storage.length; i++) {
+            data[storage.key(i)] = storage.getItem(storage.key(i));
+        }
+        return data;
+    }
+    return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+RESTORE_SCRIPT = """
+    var state = arguments[0];
+    Object.keys(state.local).forEach(function (key) { window.localStorage.setItem(key, state.local[key]); });
+    Object.keys(state.session).forEach(function (key) { window.sessionStorage.setItem(key, state.session[key]); });
+"""
+
+log = Logger()
+
+
+class SessionStateStore(object):
+    def __init__(self, ttl=None, directory=None):
+        """
+        :param ttl: state lifetime in seconds, default SESSION_STATE_TTL from config
+        :param directory: directory for saved states, default SESSION_STATE_DIR from config or session_state/
+        """
+        self.ttl = ttl or CONFIG.get('SESSION_STATE_TTL', 1800)
+        self.directory = directory or CONFIG.get('SESSION_STATE_DIR') or STATE_DIR
+        self.base_url = CONFIG['BASE_URL']
+        self.login_url = CONFIG.get('LOGIN_URL', '')
+        self._states = {}
+
+    def key(self, user):
+        return '%s|%s|%s' % (user, self.base_url, CONFIG['ENV'])
+
+    def capture(self, driver, user):
+        """Save cookies and storages of logged in driver
+
+            :param driver: webdriver on application page
+            :param user: user name
+        """
+        storage = driver.execute_script(CAPTURE_SCRIPT)
+        cookies = [{key: cookie[key] for key in COOKIE_KEYS if key in cookie} for cookie in driver.get_cookies()]
+        state = {'created': time.time(), 'cookies': cookies, 'local': storage['local'],
+                 'session': storage['session']}
+        self._states[self.key(user)] = state
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        temp_file = '%s.%s.tmp' % (self.__file(user), os.getpid())
+        FileManager.save_data_to_json_file(temp_file, state)
+        os.replace(temp_file, self.__file(user))
+        log.logger('INFO', 'Session state of %s saved', user)
+
+    def get(self, user):
+        """Saved, not expired state of user
+
+            :param user: user name
+            :return: state dictionary or None
+        """
+        state = self._states.get(self.key(user))
+        if state is None and os.path.isfile(self.__file(user)):
+            try:
+                state = FileManager.load_data_from_json_file(self.__file(user))
+            except (ValueError, OSError) as e:
+                log.logger('WARNING', 'Session state of %s could not be read: %s', user, e)
+                return None
+            self._states[self.key(user)] = state
+        if state is not None and time.time() - state['created'] > self.ttl:
+            log.logger('INFO', 'Session state of %s expired', user)
+            self.invalidate(user)
+            return None
+        return state
+
+    def restore(self, driver, user, url=None):
+        """Inject saved state of user to driver and open page
+
+            :param driver: webdriver
+            :param user: user name
+            :param url: page to open after restore, default BASE_URL
+            :return: True if session was restored, False if there is no valid state
+        """
+        state = self.get(user)
+        if state is None:
+            return False
+        try:
+            driver.get(self.base_url)
+            for cookie in state['cookies']:
+                driver.add_cookie(cookie)
+            driver.execute_script(RESTORE_SCRIPT, state)
+            driver.get(url or self.base_url)
+        except WebDriverException as e:
+            log.logger('WARNING', 'Session state of %s could not be restored: %s', user, e)
+            self.invalidate(user)
+            return False
+        if self.is_login_page(driver):
+            log.logger('INFO', 'Restored session of %s redirected to login page', user)
+            self.invalidate(user)
+            return False
+        log.logger('INFO', 'Session state of %s restored', user)
+        return True
+
+    def is_login_page(self, driver):
+        """Check if driver is on LOGIN_URL page"""
+        return bool(self.login_url) and self.login_url in driver.current_url
+
+    def invalidate(self, user):
+        """Remove saved state of user
+
+            :param user: user name
+        """
+        self._states.pop(self.key(user), None)
+        try:
+            os.remove(self.__file(user))
+        except FileNotFoundError:
+            pass
+
+    def __file(self, user):
+        name = hashlib.sha1(self.key(user).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, name + '.json')
+
+
+session_store = SessionStateStore()
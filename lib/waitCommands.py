@@ -1,10 +1,13 @@
 import time
 
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 from lib.logger import Logger
+from lib.browserWait import BrowserWait
+from lib.waitStatistics import AdaptiveWait, wait_statistics
+from lib.profiler import profiler
+from lib.elementProbe import probe_elements
 from .configurationReader import load_configuration_from_file
 
 CONFIG = load_configuration_from_file('connect_config.json')
@@ -15,10 +18,36 @@ class WaitCommands:
         self.driver = driver
         self.log = Logger()
         self.wait_time = CONFIG["WAIT_TIMEOUT"]
+        self.engine = CONFIG.get("WAIT_ENGINE", "python")
+        self.browserWait = BrowserWait(self.driver)
 
-    def __web_driver_wait(self, wait=None):
+    def __web_driver_wait(self, wait=None, selector=None, condition=None):
         wait = wait or self.wait_time
-        return WebDriverWait(self.driver, wait)
+        return AdaptiveWait(self.driver, wait, selector, condition)
+
+    def __until(self, selector, condition, ec_condition, wait=None, expected_text=None, negate=False):
+        """Wait with engine set by WAIT_ENGINE in config: 'browser' waits inside the page,
+        'python' polls with AdaptiveWait. Browser engine falls back to python one when
+        script can't be executed in current page.
+        """
+        with profiler.measure('wait', '%s %s' % (condition, wait_statistics.key(selector))):
+            return self.__engine_until(selector, condition, ec_condition, wait, expected_text, negate)
+
+    def __engine_until(self, selector, condition, ec_condition, wait, expected_text, negate):
+        if self.engine == 'browser':
+            start = time.time()
+            try:
+                result = self.browserWait.until(selector, condition, wait or self.wait_time, expected_text)
+                wait_statistics.record(selector, condition, time.time() - start, True)
+                return result
+            except TimeoutException:
+                wait_statistics.record(selector, condition, time.time() - start, False)
+                raise
+            except WebDriverException as e:
+                self.log.logger('WARNING', 'Browser wait failed, using python wait: %s', e)
+        if negate:
+            return self.__web_driver_wait(wait, selector, condition).until_not(ec_condition)
+        return self.__web_driver_wait(wait, selector, condition).until(ec_condition)
 
     def wait_for_element_visibility(self, selector, wait=None):
         """Wait some time until expected element will be visible on current page
@@ -27,7 +56,7 @@ class WaitCommands:
             :param wait: time to wait
         """
         try:
-            element = self.__web_driver_wait(wait).until(EC.visibility_of_element_located(selector))
+            element = self.__until(selector, 'visibility', EC.visibility_of_element_located(selector), wait)
             return element
         except (TimeoutException, NoSuchElementException):
             raise AssertionError('Could not find element' + str(selector))
@@ -35,7 +64,8 @@ class WaitCommands:
     def wait_for_js_alert_not_visibility(self, wait=None):
         """ Wait for 5 seconds until connect JavaScript alert missing """
         alert_selector = (By.CSS_SELECTOR, "body > div.notifyjs-corner")
-        self.__web_driver_wait(wait).until_not(EC.visibility_of_element_located(alert_selector))
+        self.__web_driver_wait(wait, alert_selector, 'invisibility').until_not(
+            EC.visibility_of_element_located(alert_selector))
 
     def wait_for_element_not_visibility(self, *selector, wait=None):
         """Wait some time until visible element disappear
@@ -44,16 +74,44 @@ class WaitCommands:
             :param wait: time to wait
         """
         try:
-            self.__web_driver_wait(wait).until_not(EC.visibility_of_element_located(selector))
+            self.__until(selector, 'invisibility', EC.visibility_of_element_located(selector), wait, negate=True)
         except (TimeoutException, NoSuchElementException):
             raise AssertionError("Element should not be visible: " + str(selector))
 
+    def wait_for_elements_visibility(self, selectors, wait=None):
+        """Wait some time until all elements are visible. Every poll checks all elements with one script call.
+
+            :param selectors: list of element selectors
+            :param wait: time to wait
+        """
+        try:
+            with profiler.measure('wait', 'visibility of %s elements' % len(selectors)):
+                self.__web_driver_wait(wait, 'elements', 'visibility').until(
+                    lambda driver: all(state.displayed for state in probe_elements(driver, selectors)))
+        except TimeoutException:
+            states = probe_elements(self.driver, selectors)
+            hidden = [str(selector) for selector, state in zip(selectors, states) if not state.displayed]
+            raise AssertionError('Could not find elements: ' + ', '.join(hidden))
+
+    def wait_for_elements_not_visibility(self, selectors, wait=None):
+        """Wait some time until all elements disappear
+
+            :param selectors: list of element selectors
+            :param wait: time to wait
+        """
+        try:
+            with profiler.measure('wait', 'invisibility of %s elements' % len(selectors)):
+                self.__web_driver_wait(wait, 'elements', 'invisibility').until(
+                    lambda driver: not any(state.displayed for state in probe_elements(driver, selectors)))
+        except TimeoutException:
+            raise AssertionError('Elements should not be visible: ' + ', '.join(str(s) for s in selectors))
+
     def wait_for_alert_not_visibility(self, wait=None):
         """ Wait some time until page alert is not visible on page
             :param wait: time to wait
         """
         try:
-            self.__web_driver_wait(wait).until_not(EC.alert_is_present())
+            self.__web_driver_wait(wait, 'alert', 'invisibility').until_not(EC.alert_is_present())
         except TimeoutException:
             raise AssertionError("Alert still visible")
 
@@ -65,7 +123,7 @@ class WaitCommands:
             :return: element or raise Assertion 
         """
         try:
-            return self.__web_driver_wait(wait).until(EC.presence_of_element_located(*selector))
+            return self.__until(selector[0], 'presence', EC.presence_of_element_located(*selector), wait)
         except (TimeoutException, NoSuchElementException):
             raise AssertionError('Timeout, elemenent is not presented')
 
@@ -77,7 +135,8 @@ class WaitCommands:
             :param wait: time to wait
         """
         try:
-            return self.__web_driver_wait(wait).until(EC.text_to_be_present_in_element(selector, expected_text))
+            return self.__until(selector, 'text', EC.text_to_be_present_in_element(selector, expected_text), wait,
+                                expected_text)
         except (TimeoutException, NoSuchElementException):
             raise AssertionError('Something went wrong with reading text from the element' + str(selector))
 
@@ -88,9 +147,9 @@ class WaitCommands:
         :return: Bool
         """
         try:
-            self.__web_driver_wait(wait).until(EC.alert_is_present())
+            self.__web_driver_wait(wait, 'alert', 'presence').until(EC.alert_is_present())
             alert = self.driver.switch_to.alert
-            self.log.logger('INFO', 'Alert presented with message: %s' % alert.text)
+            self.log.logger('INFO', 'Alert presented with message: %s', alert.text)
         except TimeoutException:
             raise AssertionError('Alert not presented')
 
@@ -100,9 +159,9 @@ class WaitCommands:
         :param wait: time to wait for alert
         """
         try:
-            self.__web_driver_wait(wait).until(EC.alert_is_present())
+            self.__web_driver_wait(wait, 'alert', 'presence').until(EC.alert_is_present())
             alert = self.driver.switch_to.alert
-            self.log.logger('INFO', 'Alert text: %s\n' % alert.text)
+            self.log.logger('INFO', 'Alert text: %s\n', alert.text)
             alert.accept()
             self.log.logger('INFO', "Alert has been accepted")
         except TimeoutException:
@@ -117,14 +176,15 @@ class WaitCommands:
         :return: element if clickable or assertionError if not
         """
         try:
-            return self.__web_driver_wait(wait).until(EC.element_to_be_clickable(selector))
+            return self.__until(selector, 'clickable', EC.element_to_be_clickable(selector), wait)
         except TimeoutException as e:
             self.log.logger('ERROR', e)
             raise AssertionError('Element is not clickable')
 
     def wait_for_condition(self, condition):
-        self.__web_driver_wait(self.driver).until(lambda x: condition)
+        self.__web_driver_wait(None, 'condition', 'custom').until(lambda x: condition)
 
     @staticmethod
     def wait(seconds):
-        time.sleep(seconds)
+        with profiler.measure('sleep', '%s sec' % seconds):
+            time.sleep(seconds)
@@ -0,0 +1,180 @@
+"""Wait time statistics and adaptive polling wait
+
+Every wait records how long selector needed to satisfy condition. Histogram of
+these times is used to choose first poll interval of next wait and to suggest
+per-selector timeouts.
+
+usage: AdaptiveWait(driver, 5, (By.ID, 'element/id'), 'visibility').until(condition)
+
+"""
+
+import time
+import atexit
+import threading
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from lib.configurationReader import load_configuration_from_file
+from lib.fileManager import FileManager
+
+CONFIG = load_configuration_from_file('connect_config.json')
+
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60)
+MIN_POLL = 0.01
+FIRST_POLL = 0.05
+MAX_POLL = 0.5
+
+
+class WaitStatistics(object):
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(selector):
+        """Text key of selector e.g. 'id=element/id'"""
+        if isinstance(selector, (tuple, list)) and len(selector) == 2:
+            return '%s=%s' % tuple(selector)
+        return str(selector)
+
+    def record(self, selector, condition, elapsed, success):
+        """Save result of single wait
+
+            :param selector: tuple (eg. By.ID, 'element/id') or name of waited object
+            :param condition: condition name e.g. 'visibility'
+            :param elapsed: wait time in seconds
+            :param success: False if wait timed out
+        """
+        with self._lock:
+            stat = self._stats.setdefault((self.key(selector), condition), {
+                'count': 0, 'timeouts': 0, 'total': 0.0, 'max': 0.0, 'histogram': [0] * (len(BUCKETS) + 1)})
+            stat['count'] += 1
+            if not success:
+                stat['timeouts'] += 1
+                return
+            stat['total'] += elapsed
+            stat['max'] = max(stat['max'], elapsed)
+            stat['histogram'][self.__bucket(elapsed)] += 1
+
+    def percentile(self, selector, condition, percent):
+        """Upper bucket bound of successful wait times percentile
+
+            :return: time in seconds or None when there is no data
+        """
+        stat = self._stats.get((self.key(selector), condition))
+        if not stat or stat['count'] == stat['timeouts']:
+            return None
+        histogram = stat['histogram']
+        limit = sum(histogram) * percent / 100.0
+        counted = 0
+        for index, count in enumerate(histogram):
+            counted += count
+            if counted >= limit:
+                return BUCKETS[index] if index < len(BUCKETS) else stat['max']
+        return stat['max']
+
+    def poll_interval(self, selector, condition):
+        """First poll interval for wait, based on median of previous waits"""
+        median = self.percentile(selector, condition, 50)
+        if median is None:
+            return FIRST_POLL
+        return min(max(median / 4.0, MIN_POLL), MAX_POLL)
+
+    def suggested_timeout(self, selector, condition):
+        """Timeout suggestion: twice 95th percentile of previous waits"""
+        p95 = self.percentile(selector, condition, 95)
+        return None if p95 is None else round(p95 * 2, 2)
+
+    def reset(self):
+        """Forget all recorded waits"""
+        with self._lock:
+            self._stats.clear()
+
+    def to_dict(self):
+        with self._lock:
+            items = sorted(self._stats.items())
+        result = {}
+        for (selector, condition), stat in items:
+            successful = stat['count'] - stat['timeouts']
+            result.setdefault(selector, {})[condition] = {
+                'count': stat['count'],
+                'timeouts': stat['timeouts'],
+                'average': round(stat['total'] / successful, 3) if successful else None,
+                'max': round(stat['max'], 3),
+                'histogram': dict(zip([str(b) for b in BUCKETS] + ['inf'], stat['histogram'])),
+                'suggested_timeout': self.suggested_timeout(selector, condition),
+            }
+        return result
+
+    def dump(self, filename):
+        """Save statistics to json file
+
+            :param filename: path to file
+        """
+        FileManager.save_data_to_json_file(filename, self.to_dict())
+
+    @staticmethod
+    def __bucket(elapsed):
+        for index, bound in enumerate(BUCKETS):
+            if elapsed <= bound:
+                return index
+        return len(BUCKETS)
+
+
+wait_statistics = WaitStatistics()
+if CONFIG.get('WAIT_STATS_FILE'):
+    atexit.register(wait_statistics.dump, CONFIG['WAIT_STATS_FILE'])
+
+
+class AdaptiveWait(object):
+    IGNORED_EXCEPTIONS = (NoSuchElementException,)
+
+    def __init__(self, driver, timeout, selector, condition, statistics=wait_statistics):
+        """Wait which polls tight at first and then doubles poll interval up to MAX_POLL
+
+            :param driver: webdriver
+            :param timeout: time to wait
+            :param selector: tuple (eg. By.ID, 'element/id') or name of waited object
+            :param condition: condition name used in statistics
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.selector = selector
+        self.condition = condition
+        self.statistics = statistics
+
+    def until(self, method, message=''):
+        """Call method until it returns value different from False
+
+            :return: method result
+        """
+        return self.__poll(method, message, False)
+
+    def until_not(self, method, message=''):
+        """Call method until it returns False
+
+            :return: True
+        """
+        return self.__poll(method, message, True)
+
+    def __poll(self, method, message, negate):
+        start = time.time()
+        end = start + self.timeout
+        interval = self.statistics.poll_interval(self.selector, self.condition)
+        while True:
+            try:
+                value = method(self.driver)
+                if negate and not value:
+                    value = True
+                elif negate:
+                    value = False
+            except self.IGNORED_EXCEPTIONS:
+                value = negate
+            if value:
+                self.statistics.record(self.selector, self.condition, time.time() - start, True)
+                return value
+            now = time.time()
+            if now >= end:
+                break
+            time.sleep(min(interval, end - now))
+            interval = min(interval * 2, MAX_POLL)
+        self.statistics.record(self.selector, self.condition, time.time() - start, False)
+        raise TimeoutException(message)
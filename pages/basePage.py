@@ -0,0 +1,145 @@
+"""Page objects with lazily resolved elements
+
+Elements are declared on class as Locator and looked up only when used.
+Selectors listed in LOADED are checked together with one script call.
+
+usage:
+    class LoginPage(BasePage):
+        URL = '/login'
+        LOADED = ('login', 'password')
+        login = Locator(By.ID, 'login')
+        password = Locator(By.ID, 'password')
+
+    page = LoginPage(driver).open()
+    page.login.fill_in('user')
+
+All page objects and components of one driver share single DriverCommands
+instance, see get_commands().
+
+"""
+
+from lib.driverCommands import DriverCommands
+from lib.configurationReader import load_configuration_from_file
+
+CONFIG = load_configuration_from_file('connect_config.json')
+
+
+def get_commands(driver):
+    """DriverCommands shared by all page objects of driver. Commands are kept on driver
+    object, so they are freed together with driver.
+
+        :param driver: webdriver
+        :return: DriverCommands
+    """
+    # vars() instead of getattr(), EventFiringWebDriver reports missing attribute to on_exception
+    commands = vars(driver).get('_pageCommands')
+    if commands is None:
+        commands = driver._pageCommands = DriverCommands(driver)
+    return commands
+
+
+class Element(object):
+    """Selector bound to driver commands, element is searched on every action"""
+    __slots__ = ('commands', 'selector')
+
+    def __init__(self, commands, selector):
+        """
+        :param commands: DriverCommands
+        :param selector: tuple (eg. By.ID, 'element/id')
+        """
+        self.commands = commands
+        self.selector = selector
+
+    def find(self):
+        return self.commands.find_element(self.selector)
+
+    def click(self):
+        self.commands.click_by_locator(self.selector)
+
+    def fill_in(self, value, confirm=False):
+        self.commands.fill_in(self.selector, value, confirm)
+
+    @property
+    def text(self):
+        return self.commands.get_text_from_element(self.selector)
+
+    def attribute(self, attribute='value'):
+        return self.commands.get_attribute_from_element(self.selector, attribute)
+
+    def is_displayed(self):
+        return self.commands.is_element_displayed(self.selector)
+
+    def wait_visible(self, wait=None):
+        return self.commands.waitCommands.wait_for_element_visibility(self.selector, wait)
+
+    def __repr__(self):
+        return 'Element(%s, %r)' % self.selector
+
+
+class Locator(object):
+    """Class level element declaration, gives Element bound to page on first access"""
+    __slots__ = ('selector', 'name')
+
+    def __init__(self, by, value):
+        self.selector = (by, value)
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, page, owner):
+        if page is None:
+            return self
+        element = Element(page.commands, self.selector)
+        page.__dict__[self.name] = element
+        return element
+
+
+class Component(object):
+    """Part of page, e.g. menu or table. Methods of DriverCommands are available on component."""
+    LOADED = ()
+
+    def __init__(self, driver):
+        """
+        :param driver: webdriver
+        """
+        self.driver = driver
+        self.commands = get_commands(driver)
+        self.log = self.commands.log
+
+    def __getattr__(self, name):
+        if name == 'commands':
+            raise AttributeError(name)
+        return getattr(self.commands, name)
+
+    def loaded_selectors(self):
+        return [getattr(type(self), name).selector for name in self.LOADED]
+
+    def is_loaded(self):
+        """Check if all LOADED elements are displayed with one script call"""
+        selectors = self.loaded_selectors()
+        return all(state.displayed for state in self.commands.probe_elements(selectors)) if selectors else True
+
+    def wait_until_loaded(self, wait=None):
+        """Wait until all LOADED elements are displayed, every poll is one script call
+
+            :param wait: time to wait
+        """
+        selectors = self.loaded_selectors()
+        if selectors:
+            self.commands.waitCommands.wait_for_elements_visibility(selectors, wait)
+        return self
+
+
+class BasePage(Component):
+    URL = None
+
+    def open(self, force=False, wait=10):
+        """Open page URL (relative to BASE_URL) and wait until page is loaded
+
+            :param force: open url even if browser is already on it
+            :param wait: time to wait
+        """
+        ready = (lambda driver: self.is_loaded()) if self.LOADED else None
+        self.commands.open_url(CONFIG['BASE_URL'] + self.URL, ready=ready, force=force, wait=wait)
+        return self
@@ -0,0 +1,26 @@
+from selenium.webdriver.common.by import By
+from pages.basePage import Component, Element, Locator
+
+
+class Menu(Component):
+    LOADED = ('launcher',)
+    launcher = Locator(By.CSS_SELECTOR, "[module='shell.menu.ProductLauncher']")
+
+    def item(self, name):
+        """Menu item by its text
+
+            :param name: text of menu item
+            :return: Element
+        """
+        return Element(self.commands, (By.LINK_TEXT, name))
+
+    def go_to(self, name):
+        """Open menu and click on item
+
+            :param name: text of menu item
+        """
+        item = self.item(name)
+        if not item.is_displayed():
+            self.launcher.click()
+        item.click()
+        self.log.logger('INFO', 'Menu item selected: %s', name)
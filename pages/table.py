@@ -1,52 +1,202 @@
-from lib.driverCommands import DriverCommands
+import time
+from pages.basePage import Component
 from selenium.common.exceptions import StaleElementReferenceException
 from selenium.webdriver.common.by import By
 
+MATRIX_RETRIES = 3
 
-class Table(DriverCommands):
+TABLE_SIGNAL_FUNCTION = """
+    function tableSignal(root) {
+        if (root.__seleniumTableId === undefined) {
+            root.__seleniumTableId = Math.random();
+            root.__seleniumMutations = 0;
+            root.__seleniumObserver = new MutationObserver(function (mutations) {
+                root.__seleniumMutations += mutations.length;
+            });
+            root.__seleniumObserver.observe(root, {childList: true, subtree: true, characterData: true});
+        }
+        root.__seleniumMutations += root.__seleniumObserver.takeRecords().length;
+        return [root.__seleniumTableId, root.getElementsByTagName('tr').length, root.__seleniumMutations];
+    }
+"""
 
-    def table_create_matrix(self):
+TABLE_DATA_SCRIPT = TABLE_SIGNAL_FUNCTION + """
+    var root = arguments[0] ? document.querySelector(arguments[0]) : document;
+    var attributes = arguments[1] || [];
+    var result = {headers: [], rows: [], attributes: []};
+    if (!root) { return null; }
+    result.signal = tableSignal(root);
+    var rows = root.getElementsByTagName('tr');
+    for (var i = 0; i < rows.length; i++) {
+        var cells = rows[i].getElementsByTagName('td');
+        var row = [];
+        var rowAttributes = [];
+        for (var j = 0; j < cells.length; j++) {
+            row.push(cells[j].innerText);
+            if (attributes.length) {
+                var cellAttributes = {};
+                for (var k = 0; k < attributes.length; k++) {
+                    cellAttributes[attributes[k]] = cells[j].getAttribute(attributes[k]);
+                }
+                rowAttributes.push(cellAttributes);
+            }
+        }
+        if (!cells.length && !result.headers.length) {
+            var headers = rows[i].getElementsByTagName('th');
+            for (var h = 0; h < headers.length; h++) {
+                result.headers.push(headers[h].innerText);
+            }
+        }
+        result.rows.push(row);
+        result.attributes.push(rowAttributes);
+    }
+    return result;
+"""
+
+TABLE_CELL_SCRIPT = """
+    var root = arguments[0] ? document.querySelector(arguments[0]) : document;
+    var row = root.getElementsByTagName('tr')[arguments[1]];
+    if (!row) { return null; }
+    return arguments[2] === null ? row : row.getElementsByTagName('td')[arguments[2]] || null;
+"""
+
+
+TABLE_SIGNAL_SCRIPT = TABLE_SIGNAL_FUNCTION + """
+    var root = arguments[0] ? document.querySelector(arguments[0]) : document;
+    return root ? tableSignal(root) : null;
+"""
+
+
+class Table(Component):
+
+    def __init__(self, driver, table_selector=None):
+        """
+        :param driver: webdriver
+        :param table_selector: css selector of table, default all rows on page are used
+        """
+        Component.__init__(self, driver)
+        self.table_selector = table_selector
+        self._index = None
+        self._index_key = None
+
+    def table_create_matrix(self, bulk=False):
+        """Create matrix (row x column) of table cells
+
+            :param bulk: if True cell texts are read in one javascript call instead of td elements
+            :return: matrix of td elements or of cell texts in bulk mode
+        """
+        if bulk:
+            return self.table_extract_data()['rows']
         self.log.logger('INFO', 'Creating matrix')
-        rows = self.get_all_rows()
-        matrix = []
-        try:
-            for row in rows:
-                col = row.find_elements(By.TAG_NAME, "td")
-                matrix.append(col)
-        except StaleElementReferenceException as e:
-            self.log.logger('WARNING', e)
-            self.table_create_matrix()
-        return matrix
+        for attempt in range(MATRIX_RETRIES):
+            try:
+                return [row.find_elements(By.TAG_NAME, "td") for row in self.get_all_rows()]
+            except StaleElementReferenceException as e:
+                self.log.logger('WARNING', 'Table changed while creating matrix, attempt %s: %s', attempt + 1, e)
+        return [row.find_elements(By.TAG_NAME, "td") for row in self.get_all_rows()]
+
+    def table_extract_data(self, attributes=None):
+        """Read whole table as plain data in one javascript call
+
+            :param attributes: list of cell attributes to read e.g. ['class', 'data-id']
+            :return: dictionary with keys:
+                * 'headers' - list of header texts
+                * 'rows' - matrix (row x column) of cell texts
+                * 'attributes' - matrix of {attribute: value} dicts, empty rows if attributes not given
+                * 'signal' - table change signal read in the same call, see get_table_index()
+        """
+        self.log.logger('INFO', 'Extracting table data')
+        data = self.driver.execute_script(TABLE_DATA_SCRIPT, self.table_selector, attributes or [])
+        if data is None:
+            raise AssertionError('Table not found: %s' % self.table_selector)
+        return data
+
+    def get_cell_element(self, row, column):
+        """Get web element of single cell. Use it with table_extract_data() indexes
+        when element handle is needed e.g. to click the cell.
+
+            :param row: row index (counted as in table_extract_data()['rows'])
+            :param column: column index
+            :return: td element
+        """
+        element = self.driver.execute_script(TABLE_CELL_SCRIPT, self.table_selector, row, column)
+        if element is None:
+            raise AssertionError('Table cell [%s][%s] not found' % (row, column))
+        return element
+
+    def get_row_element(self, row):
+        """Get web element of table row
+
+            :param row: row index (counted as in table_extract_data()['rows'])
+            :return: tr element
+        """
+        element = self.driver.execute_script(TABLE_CELL_SCRIPT, self.table_selector, row, None)
+        if element is None:
+            raise AssertionError('Table row [%s] not found' % row)
+        return element
 
     def get_all_rows(self):
         rows = self.find_elements((By.TAG_NAME, 'tr'))
         return rows
 
-    def find_table_record(self, name, records):
-        for rec in records:
-            try:
-                rec_data = rec.text
-                if rec_data == 'No matching records found' or rec_data == '':
-                    continue
-                rec_name = rec_data.split()[0]
-                if name == rec_name:
-                    self.log.logger('INFO', '%s - I found it!' % rec_name)
-                    return True, rec
-                elif 'Loading' in rec_name:
-                    self.log.logger('INFO', 'List still not fully laod, wait 0.1 sec')
-                    self.wait(0.1)
-                    new_records = self.get_all_rows()
-                    result = self.find_table_record(name, new_records)
-                    return result
-                else:
-                    self.log.logger('INFO', 'Found table record with data: %s' % rec_name)
-            except StaleElementReferenceException as e:
-                self.log.logger('WARNING', 'Selenium error: %s' % e)
-                self.log.logger('INFO', 'Trying again...')
-                new_records = self.get_all_rows()
-                result = self.find_table_record(name, new_records)
-                return result
-        else:
-            self.log.logger('WARNING', "It's not here!")
-            return False, 'Table record: %s not found' % name
+    def find_table_record(self, name, records=None, column=None, wait=10):
+        """Find table row by its key value. Rows are indexed once, next lookups are answered
+        from the index until table changes (row count or DOM mutation of the table).
+
+            :param name: searched key value
+            :param records: not used, rows are read from the page; kept for compatibility
+            :param column: column index used as key, default first word of the row
+            :param wait: max time to wait while table shows 'Loading' row
+            :return: tuple (True, row element) or (False, message)
+        """
+        index = self.get_table_index(column, wait)
+        if name in index:
+            self.log.logger('INFO', '%s - I found it!', name)
+            return True, self.get_row_element(index[name])
+        self.log.logger('WARNING', "It's not here!")
+        return False, 'Table record: %s not found' % name
+
+    def get_table_index(self, column=None, wait=10):
+        """Get dictionary {key value: row index}. Index is rebuilt only when table changed.
+
+            :param column: column index used as key, default first word of the row
+            :param wait: max time to wait while table shows 'Loading' row
+            :return: dictionary
+        """
+        signal = self.driver.execute_script(TABLE_SIGNAL_SCRIPT, self.table_selector)
+        if self._index is not None and self._index_key == (column, signal):
+            return self._index
+        # signal is read by the same script as rows, so rows added later change it
+        data = self._wait_for_loaded_data(wait)
+        rows = data['rows']
+        index = {}
+        for row_number, row in enumerate(rows):
+            key = self._row_key(row, column)
+            if key:
+                index.setdefault(key, row_number)
+        self._index = index
+        self._index_key = (column, data['signal'])
+        self.log.logger('INFO', 'Table index built with %s records', len(index))
+        return index
+
+    def _wait_for_loaded_data(self, wait):
+        delay = 0.05
+        deadline = time.time() + wait
+        while True:
+            data = self.table_extract_data()
+            if not any('Loading' in self._row_key(row) for row in data['rows']):
+                return data
+            if time.time() + delay > deadline:
+                raise AssertionError('Table still loading after %s seconds' % wait)
+            self.log.logger('INFO', 'List still not fully loaded, wait %s sec', delay)
+            time.sleep(delay)
+            delay = min(delay * 2, 1)
 
+    @staticmethod
+    def _row_key(row, column=None):
+        if column is not None:
+            return row[column].strip() if column < len(row) else ''
+        words = ' '.join(row).split()
+        if not words or ' '.join(row).strip() == 'No matching records found':
+            return ''
+        return words[0]
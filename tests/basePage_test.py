@@ -0,0 +1,36 @@
+import unittest
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.events import EventFiringWebDriver, AbstractEventListener
+from pages.basePage import get_commands
+
+
+class FakeDriver(WebDriver):
+    def __init__(self):
+        pass
+
+
+class RecordingListener(AbstractEventListener):
+    def __init__(self):
+        self.exceptions = []
+
+    def on_exception(self, exception, driver):
+        self.exceptions.append(exception)
+
+
+class GetCommandsTest(unittest.TestCase):
+    def test_01_commands_shared_per_driver(self):
+        driver = FakeDriver()
+        self.assertIs(get_commands(driver), get_commands(driver))
+        self.assertIsNot(get_commands(driver), get_commands(FakeDriver()))
+
+    def test_02_event_firing_driver_listener_not_called(self):
+        listener = RecordingListener()
+        driver = EventFiringWebDriver(FakeDriver(), listener)
+        commands = get_commands(driver)
+        self.assertIs(get_commands(driver), commands)
+        self.assertIs(commands.driver, driver)
+        self.assertEqual(listener.exceptions, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
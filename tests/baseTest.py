@@ -1,33 +1,98 @@
 
-from lib.createDriver import create_driver
-from lib.logger import whoami, Logger
+from lib.driverPool import get_driver_pool
+from lib.logger import whoami, Logger, set_test_id
+from lib.profiler import profiler
+from lib.dataDriven import expand_data_driven
+from lib.sessionState import session_store
+from lib.scheduler import get_timing_database, class_id
+from lib.networkMock import network_mock
 from lib.configurationReader import load_configuration_from_file
 from lib.listeners import Listerers
 from selenium.webdriver.support.events import EventFiringWebDriver
 
+import time
 import unittest
 
+# start browsers in background while tests are still being collected
+if load_configuration_from_file('connect_config.json').get('PREWARM'):
+    get_driver_pool()
+
 
 class BaseTest(unittest.TestCase, Logger):
     driver = None
+    tests_run = 0
+    current_state = None
+    logged_in_user = None
     CONFIG = load_configuration_from_file('connect_config.json')
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        expand_data_driven(cls)
+
     @classmethod
     def setUpClass(cls):
         cls.logger('INFO', 'New test suite start')
-        cls.driver = create_driver()
+        cls.class_start = time.time()
+        cls.driver = get_driver_pool().acquire(cls.CONFIG.get('POOL_ACQUIRE_TIMEOUT', 600))
+        cls.tests_run = 0
+        cls.current_state = None
+        cls.logged_in_user = None
 
     def setUp(self):
+        self.test_start = time.time()
+        set_test_id(self._testMethodName)
         whoami()
-        self.driver = EventFiringWebDriver(self.driver, Listerers(self.__dict__))
-        # LOGIN OR SOMETHING SIMILAR
+        profiler.start_test('%s;%s' % (self.__class__.__name__, self._testMethodName))
+        self.__class__.tests_run += 1
+        self.driver = EventFiringWebDriver(self.driver, Listerers(self))
+        self.login(self.CONFIG['LOGIN'])
+
+    def login(self, user):
+        """Restore saved session of user. If there is no valid saved session, log in with
+        login_via_ui() and save session state for next tests.
+
+            :param user: user name
+        """
+        if self.__class__.logged_in_user == user:
+            return
+        if session_store.restore(self.driver, user) or self.login_via_ui(user):
+            self.__class__.logged_in_user = user
+        if self.__class__.logged_in_user == user and session_store.get(user) is None:
+            session_store.capture(self.driver, user)
+
+    def login_via_ui(self, user):
+        """Override to log in through login form
+
+            :param user: user name
+            :return: True if user was logged in
+        """
+        return False
+
+    def ensure_state(self, state):
+        """Prepare page state for data driven case, only if previous case had different state
+
+            :param state: state value from data record
+        """
+        if self.__class__.current_state != state:
+            self.prepare_state(state)
+            self.__class__.current_state = state
+
+    def prepare_state(self, state):
+        """Override to bring driver to state needed by data driven cases e.g. login and open page
+
+            :param state: state value from data record
+        """
+        pass
 
     def tearDown(self):
         whoami()
         # LOGOUT OR SOMETHING SIMILAR
+        network_mock.collect(self.driver)
+        get_timing_database().record_method(class_id(self.__class__), self._testMethodName,
+                                            time.time() - self.test_start)
 
     @classmethod
     def tearDownClass(cls):
-        cls.driver.close()
-        cls.driver.quit()
+        get_driver_pool().release(cls.driver, cls.tests_run)
+        get_timing_database().record_class(class_id(cls), time.time() - cls.class_start)
         cls.logger('INFO', 'Test suite finished')
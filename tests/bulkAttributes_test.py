@@ -0,0 +1,32 @@
+import unittest
+from selenium.webdriver.common.by import By
+from lib.createDriver import create_driver
+from lib.driverCommands import DriverCommands
+from benchmarks.fixtures import FixtureServer, ATTRIBUTE_ELEMENTS, ATTRIBUTES
+
+
+class BulkAttributesTest(unittest.TestCase):
+    """get_attributes has to return the same values as WebElement.get_attribute"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FixtureServer().__enter__()
+        cls.driver = create_driver()
+        cls.driver.get(cls.server.url('/attributes'))
+        cls.commands = DriverCommands(cls.driver)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.driver.quit()
+        cls.server.__exit__()
+
+    def test_01_bulk_equals_single_element(self):
+        selectors = [(By.ID, element_id) for element_id in ATTRIBUTE_ELEMENTS]
+        for attribute in ATTRIBUTES:
+            bulk = self.commands.get_attributes(selectors, attribute)
+            single = [self.driver.find_element(*selector).get_attribute(attribute) for selector in selectors]
+            self.assertEqual(bulk, single, 'attribute %s' % attribute)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import copy
+import pickle
+import unittest
+from lib import configurationReader
+from lib.configurationReader import load_configuration_from_file, set_overrides, apply_cli_overrides
+
+CONFIG_FILE = 'connect_config.json'
+
+
+class ConfigurationReaderTest(unittest.TestCase):
+    def setUp(self):
+        self.file_config = load_configuration_from_file(CONFIG_FILE)
+
+    def tearDown(self):
+        os.environ.pop('SELENIUM_WAIT_TIMEOUT', None)
+        configurationReader._overrides.clear()
+        configurationReader._cache.clear()
+
+    def test_01_configuration_is_cached_and_read_only(self):
+        config = load_configuration_from_file(CONFIG_FILE)
+        self.assertIs(config, load_configuration_from_file(CONFIG_FILE))
+        self.assertEqual(config.BROWSER, config['BROWSER'])
+        with self.assertRaises(TypeError):
+            config.BROWSER = 'FF'
+        with self.assertRaises(TypeError):
+            config.PERF_PROFILE['HEADLESS'] = False
+
+    def test_02_environment_overrides_file(self):
+        os.environ['SELENIUM_WAIT_TIMEOUT'] = '7'
+        set_overrides()
+        self.assertEqual(load_configuration_from_file(CONFIG_FILE)['WAIT_TIMEOUT'], 7)
+
+    def test_03_set_overrides_win_over_environment(self):
+        os.environ['SELENIUM_WAIT_TIMEOUT'] = '7'
+        set_overrides(WAIT_TIMEOUT=9)
+        self.assertEqual(load_configuration_from_file(CONFIG_FILE)['WAIT_TIMEOUT'], 9)
+
+    def test_04_cli_overrides(self):
+        remaining = apply_cli_overrides(['run', '--config', 'POOL_SIZE=4', '--config=BROWSER=FF', 'tests'])
+        config = load_configuration_from_file(CONFIG_FILE)
+        self.assertEqual(remaining, ['run', 'tests'])
+        self.assertEqual((config['POOL_SIZE'], config['BROWSER']), (4, 'FF'))
+        self.assertEqual(config['BASE_URL'], self.file_config['BASE_URL'])
+
+    def test_05_pickle_and_copy(self):
+        config = load_configuration_from_file(CONFIG_FILE)
+        self.assertEqual(pickle.loads(pickle.dumps(config)), config)
+        self.assertEqual(copy.deepcopy(config).to_dict(), config.to_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
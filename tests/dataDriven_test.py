@@ -0,0 +1,65 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from lib.dataDriven import data_driven, expand_data_driven, shard_groups
+
+PAGES = ['a', 'b', 'a', 'c', 'b', 'd', 'a', 'a', 'b', 'c', 'd', 'e']
+
+
+class DataDrivenTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.data_file = os.path.join(cls.directory, 'records.json')
+        with open(cls.data_file, 'w') as fp:
+            json.dump([{'page': page, 'number': n} for n, page in enumerate(PAGES)], fp)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def expand(self, state_key, shard_index=0, shard_count=1):
+        class Cases(object):
+            @data_driven(self.data_file, state_key=state_key)
+            def test_record(self, record):
+                return record
+
+            def ensure_state(self, state):
+                self.state = state
+        expand_data_driven(Cases, shard_index, shard_count)
+        return Cases, sorted(name for name in vars(Cases) if name.startswith('test_'))
+
+    def test_01_names_use_global_record_index(self):
+        _, names = self.expand(None)
+        self.assertEqual(names, ['test_record_%02d' % n for n in range(len(PAGES))])
+
+    def test_02_case_calls_method_with_its_record(self):
+        cases, _ = self.expand('page')
+        case = cases()
+        self.assertEqual(case.test_record_1_04(), {'page': 'b', 'number': 4})
+        self.assertEqual(case.state, 'b')
+
+    def test_03_names_same_on_every_shard(self):
+        for state_key in (None, 'page'):
+            _, all_names = self.expand(state_key)
+            shards = [self.expand(state_key, shard, 3)[1] for shard in range(3)]
+            self.assertEqual(sorted(name for names in shards for name in names), all_names)
+            for names in shards:
+                self.assertTrue(names)
+
+    def test_04_cases_of_one_state_run_together(self):
+        cases, names = self.expand('page')
+        pages = [getattr(cases(), name)()['page'] for name in names]
+        self.assertEqual(pages, sorted(pages, key=PAGES.index))
+
+    def test_05_state_groups_stay_on_one_shard(self):
+        groups = [(page, [page] * PAGES.count(page)) for page in sorted(set(PAGES), key=PAGES.index)]
+        shards = [shard_groups(groups, shard, 2) for shard in range(2)]
+        self.assertEqual(sorted(state for shard in shards for state, _ in shard), sorted(set(PAGES)))
+        self.assertEqual([sum(len(cases) for _, cases in shard) for shard in shards], [6, 6])
+
+
+if __name__ == '__main__':
+    unittest.main()
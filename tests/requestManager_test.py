@@ -0,0 +1,92 @@
+import json
+import asyncio
+import threading
+import unittest
+from urllib.parse import parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from lib.requestManager import RequestManager
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    clients = set()
+    unavailable_hits = 0
+
+    def do_GET(self):
+        StandInHandler.clients.add(self.client_address)
+        if self.path.startswith('/unavailable'):
+            StandInHandler.unavailable_hits += 1
+            self.respond(503, {'error': 'unavailable'})
+        else:
+            self.respond(200, {'path': self.path})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8')
+        self.respond(200, {key: values[0] for key, values in parse_qs(body).items()})
+
+    def respond(self, code, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class RequestManagerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = 'http://%s:%s' % cls.server.server_address
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StandInHandler.clients.clear()
+        StandInHandler.unavailable_hits = 0
+        self.manager = RequestManager(timeout=5, retries=2, pool_size=4)
+
+    def tearDown(self):
+        self.manager.close()
+
+    def test_01_get_reuses_connection(self):
+        for n in range(5):
+            resp = self.manager.get(self.url + '/data', n=n)
+            self.assertEqual(resp['code'], 200)
+        self.assertEqual(len(StandInHandler.clients), 1)
+
+    def test_02_post_requests_in_payloads_order(self):
+        payloads = [{'name': 'record_%s' % n} for n in range(10)]
+        responses = self.manager.post_requests(self.url + '/records', payloads)
+        self.assertEqual([resp['response'] for resp in responses], payloads)
+        self.assertTrue(all(resp['code'] == 200 for resp in responses))
+
+    def test_03_5xx_is_retried_and_returned(self):
+        resp = self.manager.get(self.url + '/unavailable')
+        self.assertEqual(resp, {'response': {'error': 'unavailable'}, 'code': 503})
+        self.assertEqual(StandInHandler.unavailable_hits, 3)
+
+    def test_04_concurrency_independent_of_pool_size(self):
+        manager = RequestManager(timeout=5, pool_size=2, concurrency=50)
+        self.assertEqual(manager.executor._max_workers, 50)
+        self.assertEqual(manager.pool_size, 50)
+        manager.close()
+
+    def test_05_post_requests_in_running_loop(self):
+        payloads = [{'name': 'record_%s' % n} for n in range(5)]
+
+        async def send():
+            return self.manager.post_requests(self.url + '/records', payloads)
+        responses = asyncio.run(send())
+        self.assertEqual([resp['response'] for resp in responses], payloads)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import unittest
+import multiprocessing
+from lib.scheduler import TimingDatabase, DEFAULT_DURATION, split_into_shards
+
+
+class FakeTest(object):
+    def __init__(self, name):
+        self._testMethodName = name
+
+
+def save_timings(filename, number):
+    database = TimingDatabase(filename)
+    database.record_class('module.Class%s' % number, float(number))
+    database.save()
+
+
+class SchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'timings.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_01_split_balances_predicted_time(self):
+        database = TimingDatabase(self.filename)
+        for name, duration in (('A', 50), ('B', 40), ('C', 30), ('D', 20), ('E', 10)):
+            database.record_class('module.%s' % name, duration)
+        database.save()
+        groups = {'module.%s' % name: [FakeTest('test_01')] for name in 'ABCDE'}
+        shards = split_into_shards(groups, 2, TimingDatabase(self.filename))
+        self.assertEqual(shards, [[('module.A', 50), ('module.D', 20), ('module.E', 10)],
+                                  [('module.B', 40), ('module.C', 30)]])
+
+    def test_02_every_class_in_one_shard(self):
+        groups = {'module.C%s' % n: [FakeTest('test_%s' % m) for m in range(n + 1)] for n in range(7)}
+        shards = split_into_shards(groups, 3, TimingDatabase(self.filename))
+        self.assertEqual(sorted(name for shard in shards for name, _ in shard), sorted(groups))
+
+    def test_03_prediction_from_methods_and_default(self):
+        database = TimingDatabase(self.filename)
+        database.record_method('module.A', 'test_01', 2.0)
+        database.record_method('module.A', 'test_02', 4.0)
+        database.save()
+        database = TimingDatabase(self.filename)
+        self.assertEqual(database.predict('module.A', ['test_01', 'test_02', 'test_03']), 9.0)
+        self.assertEqual(database.predict('module.Unknown', ['test_01']), DEFAULT_DURATION)
+
+    def test_04_saved_durations_are_smoothed(self):
+        for duration in (10.0, 20.0):
+            database = TimingDatabase(self.filename)
+            database.record_class('module.A', duration)
+            database.save()
+        self.assertEqual(TimingDatabase(self.filename).predict('module.A'), 15.0)
+
+    def test_05_parallel_shards_keep_all_updates(self):
+        processes = [multiprocessing.Process(target=save_timings, args=(self.filename, n)) for n in range(8)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual(sorted(TimingDatabase(self.filename).timings),
+                         sorted('module.Class%s' % n for n in range(8)))
+
+
+if __name__ == '__main__':
+    unittest.main()
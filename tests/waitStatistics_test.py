@@ -0,0 +1,70 @@
+import unittest
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.webdriver.common.by import By
+from lib.waitStatistics import WaitStatistics, AdaptiveWait, BUCKETS, FIRST_POLL, MAX_POLL
+
+SELECTOR = (By.ID, 'element')
+
+
+class WaitStatisticsTest(unittest.TestCase):
+    def setUp(self):
+        self.statistics = WaitStatistics()
+
+    def test_01_no_data(self):
+        self.assertEqual(WaitStatistics.key(SELECTOR), 'id=element')
+        self.assertIsNone(self.statistics.percentile(SELECTOR, 'visibility', 50))
+        self.assertEqual(self.statistics.poll_interval(SELECTOR, 'visibility'), FIRST_POLL)
+        self.assertIsNone(self.statistics.suggested_timeout(SELECTOR, 'visibility'))
+
+    def test_02_percentiles_from_histogram(self):
+        for elapsed in (0.01, 0.02, 0.2, 0.2, 3):
+            self.statistics.record(SELECTOR, 'visibility', elapsed, True)
+        self.statistics.record(SELECTOR, 'visibility', 5, False)
+        self.assertEqual(self.statistics.percentile(SELECTOR, 'visibility', 50), 0.25)
+        self.assertEqual(self.statistics.suggested_timeout(SELECTOR, 'visibility'), 10)
+        self.assertEqual(self.statistics.poll_interval(SELECTOR, 'visibility'), 0.25 / 4)
+        stat = self.statistics.to_dict()['id=element']['visibility']
+        self.assertEqual((stat['count'], stat['timeouts'], stat['max']), (6, 1, 3))
+
+    def test_03_poll_interval_bounds_and_reset(self):
+        self.statistics.record(SELECTOR, 'fast', 0.001, True)
+        self.statistics.record(SELECTOR, 'slow', 50, True)
+        self.assertEqual(self.statistics.poll_interval(SELECTOR, 'fast'), BUCKETS[0] / 4)
+        self.assertEqual(self.statistics.poll_interval(SELECTOR, 'slow'), MAX_POLL)
+        self.statistics.reset()
+        self.assertEqual(self.statistics.to_dict(), {})
+
+
+class AdaptiveWaitTest(unittest.TestCase):
+    def setUp(self):
+        self.statistics = WaitStatistics()
+
+    def wait(self, timeout=1):
+        return AdaptiveWait('driver', timeout, SELECTOR, 'presence', self.statistics)
+
+    def test_01_until_returns_value_and_records_wait(self):
+        calls = []
+
+        def condition(driver):
+            calls.append(driver)
+            if len(calls) < 3:
+                raise NoSuchElementException()
+            return 'element'
+        self.assertEqual(self.wait().until(condition), 'element')
+        self.assertEqual(len(calls), 3)
+        stat = self.statistics.to_dict()['id=element']['presence']
+        self.assertEqual((stat['count'], stat['timeouts']), (1, 0))
+
+    def test_02_until_not(self):
+        results = iter([True, True, False])
+        self.assertTrue(self.wait().until_not(lambda driver: next(results)))
+
+    def test_03_timeout_is_recorded(self):
+        with self.assertRaises(TimeoutException):
+            self.wait(0.1).until(lambda driver: False, 'not found')
+        stat = self.statistics.to_dict()['id=element']['presence']
+        self.assertEqual((stat['count'], stat['timeouts']), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()